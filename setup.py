@@ -111,6 +111,7 @@ optional_dependencies = {
     "ROOT": [False, "provides the ROOT optimizer"],
     "ipywidgets": [False, "provides widget for jypyter (like the HTML progress bar)"],
     "chainconsumer": [False, "consumes the chains output from Monte Carlo processes"],
+    "fast_histogram": [False, "speeds up the binning of event lists for background fits"],
 }
 
 for dep_name in optional_dependencies:
@@ -1733,11 +1733,25 @@ class MLEResults(_AnalysisResults):
                 raise BadCovariance()
 
             # Generate samples from the multivariate normal distribution, i.e., accounting for the covariance of the
-            # parameters
+            # parameters. The covariance matrix is normally positive definite, so we can correlate standard normal
+            # deviates with its Cholesky factor, which is much cheaper than the SVD done by multivariate_normal.
+            # The latter is kept for semi-definite matrices, which have no Cholesky factor
 
-            samples = np.random.multivariate_normal(
-                np.array(values).T, covariance_matrix, n_samples
-            )
+            try:
+
+                cholesky_factor = np.linalg.cholesky(covariance_matrix)
+
+            except np.linalg.LinAlgError:
+
+                samples = np.random.multivariate_normal(
+                    np.array(values).T, covariance_matrix, n_samples
+                )
+
+            else:
+
+                samples = np.array(values) + np.random.standard_normal(
+                    (n_samples, len(values))
+                ).dot(cholesky_factor.T)
 
         else:
 
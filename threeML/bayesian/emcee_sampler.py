@@ -111,6 +111,11 @@ class EmceeSampler(MCMCSampler):
 
             else:
 
+                # emcee's vectorize mode is not used: the plugins compute their
+                # likelihood from the current values of the model parameters, so
+                # a batch of walkers could only be looped over one at a time,
+                # which is what emcee does already
+
                 sampler = emcee.EnsembleSampler(
                     self._n_walkers, n_dim, self.get_posterior
                 )
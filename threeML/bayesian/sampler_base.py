@@ -1,8 +1,9 @@
 import abc
-import collections
+import ctypes
 import math
 
 import numpy as np
+import scipy.stats
 
 try:
 
@@ -24,6 +25,7 @@ except:
     using_mpi = False
 
 
+from astromodels import Log_uniform_prior, Uniform_prior
 from astromodels.core.model import Model
 from astromodels.functions.function import ModelAssertionViolation
 
@@ -34,7 +36,7 @@ from threeML.exceptions.custom_exceptions import (LikelihoodIsInfinite,
 from threeML.io.logging import setup_logger
 from threeML.plugins.DispersionSpectrumLike import DispersionSpectrumLike
 from threeML.plugins.SpectrumLike import SpectrumLike
-from threeML.utils.numba_utils import nb_sum
+from threeML.utils.numba_utils import nb_sum_log
 from threeML.utils.statistics.stats_tools import aic, bic, dic
 from threeML.utils.spectrum.share_spectrum import ShareSpectrum
 
@@ -66,10 +68,16 @@ class SamplerBase(metaclass=abc.ABCMeta):
         self._results = None
         self._is_setup = False
         self._is_registered = False
+        self._n_infinite_log_like = 0
         self._likelihood_model = likelihood_model
         self._data_list = data_list
 
-        self._n_plugins = len(list(self._data_list.keys()))
+        # keep the plugins in a tuple so that the likelihood evaluations
+        # do not have to materialize the values of the data list every time
+
+        self._datasets = tuple(self._data_list.values())
+
+        self._n_plugins = len(self._datasets)
 
         # Share spectrum flag if the spectrum should only be calculated
         # once when different data_list entries have the same input energy bins.
@@ -85,6 +93,11 @@ class SamplerBase(metaclass=abc.ABCMeta):
         else:
             self._share_spectrum = False
 
+        # build the caches of the free parameters, so that the posterior can be
+        # evaluated right away. The samplers refresh them before every run
+
+        self._update_free_parameters()
+
     @abc.abstractmethod
     def setup(self):
         pass
@@ -157,9 +170,10 @@ class SamplerBase(metaclass=abc.ABCMeta):
         Sets the model parameters to the mean of the marginal distributions
         """
         idx = self._log_probability_values.argmax()
-        for i, (parameter_name, parameter) in enumerate(self._free_parameters.items()):
 
-            par = self._samples[parameter_name][idx]
+        # read the whole row at once instead of one column per parameter
+
+        for parameter, par in zip(self._free_parameters.values(), self._raw_samples[idx, :]):
 
             parameter.value = par
 
@@ -170,12 +184,17 @@ class SamplerBase(metaclass=abc.ABCMeta):
         :return: none
         """
 
-        self._samples = collections.OrderedDict()
+        self._samples = {}
 
-        for i, (parameter_name, parameter) in enumerate(self._free_parameters.items()):
+        # store the samples column-major so that the samples of each
+        # parameter are contiguous in memory for the later reductions
+
+        raw_samples = np.asfortranarray(self._raw_samples)
+
+        for i, parameter_name in enumerate(self._free_parameters):
             # Add the samples for this parameter for this source
 
-            self._samples[parameter_name] = self._raw_samples[:, i]
+            self._samples[parameter_name] = raw_samples[:, i]
 
     def _build_results(self):
         """
@@ -186,10 +205,13 @@ class SamplerBase(metaclass=abc.ABCMeta):
 
         """
 
-        # set the median fit
+        if self._n_infinite_log_like > 1:
+
+            log.warning(
+                f"Likelihood value was infinite for {self._n_infinite_log_like} "
+                "of the evaluated points"
+            )
 
-        self.restore_median_fit()
-        
         # Find maximum of the log posterior
         idx = self._log_probability_values.argmax()
 
@@ -197,45 +219,49 @@ class SamplerBase(metaclass=abc.ABCMeta):
         approximate_MAP_point = self._raw_samples[idx, :]
 
         # Sets the values of the parameters to their MAP values
-        for i, parameter in enumerate(self._free_parameters):
+        for parameter, value in zip(self._free_parameters.values(), approximate_MAP_point):
 
-            self._free_parameters[parameter].value = approximate_MAP_point[i]
+            parameter.value = value
 
         # Get the value of the posterior for each dataset at the MAP
-        log_posteriors = collections.OrderedDict()
 
         log_prior = self._log_prior(approximate_MAP_point)
 
-        # keep track of the total number of data points
-        # and the total posterior
-
-        total_n_data_points = 0
-
-        total_log_posterior = 0
-
-        for dataset in list(self._data_list.values()):
+        log_posterior_values = (
+            np.fromiter(
+                (dataset.get_log_like() for dataset in self._datasets),
+                dtype=np.float64,
+                count=self._n_plugins,
+            )
+            + log_prior
+        )
 
-            log_posterior = dataset.get_log_like() + log_prior
+        log_posteriors = dict(
+            zip((dataset.name for dataset in self._datasets), log_posterior_values)
+        )
 
-            log_posteriors[dataset.name] = log_posterior
+        # keep track of the total number of data points
+        # and the total posterior
 
-            total_n_data_points += dataset.get_number_of_data_points()
+        total_n_data_points = sum(
+            dataset.get_number_of_data_points() for dataset in self._datasets
+        )
 
-            total_log_posterior += log_posterior
+        total_log_posterior = log_posterior_values.sum()
 
         # compute the statistical measures
 
-        statistical_measures = collections.OrderedDict()
+        statistical_measures = {}
 
         # compute the point estimates
 
+        n_free = self._n_free
+
         statistical_measures["AIC"] = aic(
-            total_log_posterior, len(
-                self._free_parameters), total_n_data_points
+            total_log_posterior, n_free, total_n_data_points
         )
         statistical_measures["BIC"] = bic(
-            total_log_posterior, len(
-                self._free_parameters), total_n_data_points
+            total_log_posterior, n_free, total_n_data_points
         )
 
         this_dic, pdic = dic(self)
@@ -269,6 +295,27 @@ class SamplerBase(metaclass=abc.ABCMeta):
 
         self._free_parameters = self._likelihood_model.free_parameters
 
+        self._n_free = len(self._free_parameters)
+
+        # buffer reused by every prior evaluation
+
+        self._prior_values = np.empty(self._n_free)
+
+        # a new run starts, so we start counting the infinite likelihoods again
+
+        self._n_infinite_log_like = 0
+
+        # pair the value setter of each free parameter with its prior once, so
+        # that the hot loops go neither through the dictionary nor through the
+        # value property and the prior lookup at every call. _set_value is the
+        # setter behind Parameter.value, so the bounds checks and the callbacks
+        # are still run
+
+        self._free_param_cache = tuple(
+            (parameter._set_value, parameter.prior)
+            for parameter in self._free_parameters.values()
+        )
+
     def get_posterior(self, trial_values):
         """Compute the posterior for the normal sampler"""
 
@@ -277,29 +324,17 @@ class SamplerBase(metaclass=abc.ABCMeta):
 
         # self._update_free_parameters()
 
-        assert len(self._free_parameters) == len(trial_values), (
+        assert self._n_free == len(trial_values), (
             "Something is wrong. Number of free parameters "
             "do not match the number of trial values."
         )
 
-        log_prior = 0
-
-        # with use_
+        log_prior = self._log_prior(trial_values)
 
-        for i, (parameter_name, parameter) in enumerate(self._free_parameters.items()):
-
-            prior_value = parameter.prior(trial_values[i])
-
-            if prior_value == 0:
-                # Outside allowed region of parameter space
-
-                return -np.inf
+        if log_prior == -np.inf:
+            # Outside allowed region of parameter space
 
-            else:
-
-                parameter.value = trial_values[i]
-
-                log_prior += math.log(prior_value)
+            return -np.inf
 
         log_like = self._log_like(trial_values)
 
@@ -312,42 +347,51 @@ class SamplerBase(metaclass=abc.ABCMeta):
 
         # Compute the sum of the log-priors
 
-        log_prior = 0
+        # evaluate each prior and assign the value in the same pass (as the
+        # original loop did: a point rejected on a later parameter leaves the
+        # previous ones assigned), the kernel then takes care of the log sum
 
-        for i, (parameter_name, parameter) in enumerate(self._free_parameters.items()):
+        prior_values = self._prior_values
+
+        for i, ((set_value, prior), trial_value) in enumerate(
+            zip(self._free_param_cache, trial_values)
+        ):
 
-            prior_value = parameter.prior(trial_values[i])
+            prior_value = prior(trial_value)
 
             if prior_value == 0:
                 # Outside allowed region of parameter space
 
                 return -np.inf
 
-            else:
+            set_value(trial_value)
 
-                parameter.value = trial_values[i]
+            prior_values[i] = prior_value
 
-                log_prior += math.log(prior_value)
-
-        return log_prior
+        return nb_sum_log(prior_values)
 
     def _log_like(self, trial_values):
         """Compute the log-likelihood"""
 
         # Get the value of the log-likelihood for this parameters
 
+        # NOTE: when running under MPI, the samplers (multinest, ultranest)
+        # give a different point to every rank, so each rank must evaluate
+        # all of the datasets here. Splitting the datasets across ranks and
+        # reducing the partial sums would mix likelihoods of different points
+
         try:
 
-            log_like_values = np.zeros(self._n_plugins)
+            log_like = 0.0
 
             # Loop over each dataset and get the likelihood values for each set
             if not self._share_spectrum:
                 # Old way; every dataset independendly - This is fine if the
                 # spectrum calc is fast.
 
-                for i, dataset in enumerate(self._data_list.values()):
+                for dataset in self._datasets:
 
-                    log_like_values[i] = dataset.get_log_like()
+                    log_like += dataset.get_log_like()
 
             else:
                 # If the calculation for the input spectrum of one of the sources is expensive
@@ -366,17 +410,17 @@ class SamplerBase(metaclass=abc.ABCMeta):
                         )
 
                 # Use these precalculated spectra to get the log_like for all plugins
-                for i, dataset in enumerate(list(self._data_list.values())):
+                for i, dataset in enumerate(self._datasets):
                     # call get log_like with precalculated spectrum
                     if self._share_spectrum_object.data_ein_edges[
                             self._share_spectrum_object.data_ebin_connect[i]] is not None:
-                        log_like_values[i] = dataset.get_log_like(
+                        log_like += dataset.get_log_like(
                             precalc_fluxes=precalc_fluxes[
                                 self._share_spectrum_object.data_ebin_connect[i]
                             ]
                         )
                     else:
-                        log_like_values[i] = dataset.get_log_like()
+                        log_like += dataset.get_log_like()
 
         except ModelAssertionViolation:
 
@@ -390,21 +434,23 @@ class SamplerBase(metaclass=abc.ABCMeta):
 
             raise
 
-        # Sum the values of the log-like
+        if not math.isfinite(log_like):
 
-        log_like = nb_sum(log_like_values)
+            # Issue warning only the first time, the others are just counted
+            # and reported at the end of the run
 
-        if not np.isfinite(log_like):
-            # Issue warning
-            keys = self._likelihood_model.free_parameters.keys()
-            params = [
-                f"{key}: {self._likelihood_model.free_parameters[key].value}"
-                for key in keys
-            ]
+            self._n_infinite_log_like += 1
 
-            log.warning(
-                f"Likelihood value is infinite for parameters: {params}"
-            )
+            if self._n_infinite_log_like == 1:
+
+                params = [
+                    f"{parameter_name}: {parameter.value}"
+                    for parameter_name, parameter in self._likelihood_model.free_parameters.items()
+                ]
+
+                log.warning(
+                    f"Likelihood value is infinite for parameters: {params}"
+                )
 
             return -np.inf
 
@@ -425,15 +471,46 @@ class MCMCSampler(SamplerBase):
         # Fractional variance for randomization
 
         # (0.1 means var = 0.1 * value )
-        p0 = []
 
-        for i in range(n_walkers):
-            this_p0 = [
-                x.get_randomized_value(variance)
-                for x in list(self._free_parameters.values())
-            ]
+        # this is the same as Parameter.get_randomized_value, i.e. a normal
+        # truncated to the boundaries for bounded parameters, but drawing the
+        # values of all the walkers at once for each parameter
 
-            p0.append(this_p0)
+        p0 = np.empty((n_walkers, self._n_free))
+
+        for i, (parameter_name, parameter) in enumerate(self._free_parameters.items()):
+
+            min_value = parameter.min_value
+            max_value = parameter.max_value
+            value = parameter.value
+
+            std = abs(variance * value)
+
+            if (min_value is not None) or (max_value is not None):
+
+                # If value is zero, then std will be zero, which doesn't make sense
+
+                if value == 0:
+
+                    log.error(
+                        "You cannot randomize parameter %s because its value is exactly zero"
+                        % parameter_name
+                    )
+
+                    raise AssertionError()
+
+                a = -np.inf if min_value is None else (min_value - value) / std
+                b = np.inf if max_value is None else (max_value - value) / std
+
+                p0[:, i] = scipy.stats.truncnorm.rvs(
+                    a, b, loc=value, scale=std, size=n_walkers
+                )
+
+            else:
+
+                # The parameter has no boundaries
+
+                p0[:, i] = np.random.normal(value, std, size=n_walkers)
 
         return p0
 
@@ -453,12 +530,26 @@ class UnitCubeSampler(SamplerBase):
         # First update the free parameters (in case the user changed them after the construction of the class)
         self._update_free_parameters()
 
+        self._n_dim = self._n_free
+
+        for parameter_name, (_, parameter_prior) in zip(
+            self._free_parameters, self._free_param_cache
+        ):
+
+            if not hasattr(parameter_prior, "from_unit_cube"):
+
+                raise RuntimeError(
+                    "The prior you are trying to use for parameter %s is "
+                    "not compatible with sampling from a unitcube"
+                    % parameter_name
+                )
+
         def loglike(trial_values, ndim=None, params=None):
 
             # NOTE: the _log_like function DOES NOT assign trial_values to the parameters
 
-            for i, parameter in enumerate(self._free_parameters.values()):
-                parameter.value = trial_values[i]
+            for (set_value, _), trial_value in zip(self._free_param_cache, trial_values):
+                set_value(trial_value)
 
             log_like = self._log_like(trial_values)
 
@@ -469,52 +560,126 @@ class UnitCubeSampler(SamplerBase):
         # and should return the value in the bounds... not the
         # probability. Therefore, we must make some transforms
 
+        # uniform and log-uniform priors have a closed form transform, so
+        # we apply it to all of their dimensions at once. The other priors
+        # fall back to their own scalar from_unit_cube
+
+        uniform_idx = []
+        uniform_bounds = []
+        log_uniform_idx = []
+        log_uniform_bounds = []
+        scalar_transforms = []
+
+        for i, (_, parameter_prior) in enumerate(self._free_param_cache):
+
+            if isinstance(parameter_prior, Uniform_prior):
+
+                uniform_idx.append(i)
+                uniform_bounds.append(
+                    (parameter_prior.lower_bound.value, parameter_prior.upper_bound.value))
+
+            elif isinstance(parameter_prior, Log_uniform_prior):
+
+                log_uniform_idx.append(i)
+                log_uniform_bounds.append(
+                    (parameter_prior.lower_bound.value, parameter_prior.upper_bound.value))
+
+            else:
+
+                scalar_transforms.append((i, parameter_prior.from_unit_cube))
+
+        uniform_idx = np.array(uniform_idx, dtype=int)
+        uniform_bounds = np.array(uniform_bounds, dtype=float).reshape(-1, 2)
+        uniform_low = uniform_bounds[:, 0]
+        uniform_spread = uniform_bounds[:, 1] - uniform_low
+
+        log_uniform_idx = np.array(log_uniform_idx, dtype=int)
+        log_uniform_bounds = np.log10(
+            np.array(log_uniform_bounds, dtype=float).reshape(-1, 2))
+        log_uniform_low = log_uniform_bounds[:, 0]
+        log_uniform_spread = log_uniform_bounds[:, 1] - log_uniform_low
+
         if return_copy:
 
+            scalar_transform = _build_unit_cube_transform(scalar_transforms)
+
             def prior(cube):
-                params = cube.copy()
 
-                for i, (parameter_name, parameter) in enumerate(
-                    self._free_parameters.items()
-                ):
+                # dynesty and ultranest keep the returned points around, so the
+                # output must be a new array every time and cannot be a reused
+                # buffer. Every entry is written, so it does not need to be a
+                # copy of the cube
 
-                    try:
+                params = np.empty_like(cube)
 
-                        params[i] = parameter.prior.from_unit_cube(params[i])
+                if uniform_idx.size:
 
-                    except AttributeError:
+                    params[uniform_idx] = uniform_low + uniform_spread * cube[uniform_idx]
+
+                if log_uniform_idx.size:
+
+                    params[log_uniform_idx] = np.power(
+                        10.0, log_uniform_low + log_uniform_spread * cube[log_uniform_idx]
+                    )
+
+                scalar_transform(cube, params)
 
-                        raise RuntimeError(
-                            "The prior you are trying to use for parameter %s is "
-                            "not compatible with sampling from a unitcube"
-                            % parameter_name
-                        )
                 return params
 
-        else:
+            # the same test run as below, with the numpy array these samplers pass
 
-            def prior(params, ndim=None, nparams=None):
+            _ = prior(np.full(self._n_dim, 0.5))
 
-                for i, (parameter_name, parameter) in enumerate(
-                    self._free_parameters.items()
-                ):
+        else:
 
-                    try:
+            # MULTINEST hands us a raw ctypes pointer which cannot be
+            # indexed with arrays, so here we stay with the scalar transforms
 
-                        params[i] = parameter.prior.from_unit_cube(params[i])
+            scalar_transform = _build_unit_cube_transform(
+                [
+                    (i, parameter_prior.from_unit_cube)
+                    for i, (_, parameter_prior) in enumerate(self._free_param_cache)
+                ]
+            )
 
-                    except AttributeError:
+            def prior(params, ndim=None, nparams=None):
 
-                        raise RuntimeError(
-                            "The prior you are trying to use for parameter %s is "
-                            "not compatible with sampling from a unitcube"
-                            % parameter_name
-                        )
+                scalar_transform(params, params)
 
             # Give a test run to the prior to check that it is working. If it crashes while multinest is going
             # it will not stop multinest from running and generate thousands of exceptions (argh!)
-            n_dim = len(self._free_parameters)
+            # The test cube is a ctypes buffer, like the one multinest passes
 
-            _ = prior([0.5] * n_dim, n_dim, [])
+            _ = prior((ctypes.c_double * self._n_dim)(*([0.5] * self._n_dim)), self._n_dim, [])
 
         return loglike, prior
+
+
+def _build_unit_cube_transform(transforms):
+    """
+    Generate a function applying the given scalar unit cube transforms
+    with the loop unrolled, i.e. the body is made of the statements
+    dst[i] = _fi(src[i]) for each transform, without any iteration or
+    lookup left for the sampler calls
+
+    :param transforms: list of (index, from_unit_cube) pairs
+    :returns: a function with signature (src, dst)
+    """
+
+    namespace = {}
+
+    lines = ["def _transform(src, dst):"]
+
+    for i, from_unit_cube in transforms:
+
+        namespace["_f%d" % i] = from_unit_cube
+
+        lines.append("    dst[%d] = _f%d(src[%d])" % (i, i, i))
+
+    if not transforms:
+
+        lines.append("    pass")
+
+    exec(compile("\n".join(lines), "<unit_cube_transform>", "exec"), namespace)
+
+    return namespace["_transform"]
@@ -1,13 +1,10 @@
-from __future__ import division
-
 import collections
 import math
-from builtins import object, range, str, zip
 
 import numpy as np
 import pandas as pd
+import scipy.linalg
 import scipy.optimize
-from past.utils import old_div
 
 from threeML.config.config import threeML_config
 from threeML.exceptions.custom_exceptions import custom_warnings
@@ -522,8 +519,7 @@ class Minimizer(object):
 
                     # Bounded only in the negative direction. Make sure we are not at the boundary
                     if np.isclose(
-                        current_value, current_min, old_div(
-                            abs(current_value), 20)
+                        current_value, current_min, abs(current_value) / 20
                     ):
 
                         log.warning(
@@ -551,8 +547,7 @@ class Minimizer(object):
                     # Bounded only in the positive direction
                     # Bounded only in the negative direction. Make sure we are not at the boundary
                     if np.isclose(
-                        current_value, current_max, old_div(
-                            abs(current_value), 20)
+                        current_value, current_max, abs(current_value) / 20
                     ):
 
                         log.warnings(
@@ -758,9 +753,8 @@ class Minimizer(object):
 
                     if variance_i * variance_j > 0:
 
-                        self._correlation_matrix[i, j] = old_div(
-                            self._covariance_matrix[i, j],
-                            (math.sqrt(variance_i * variance_j)),
+                        self._correlation_matrix[i, j] = self._covariance_matrix[i, j] / math.sqrt(
+                            variance_i * variance_j
                         )
 
                     else:
@@ -818,34 +812,32 @@ class Minimizer(object):
         :return: the covariance matrix
         """
 
-        minima = [
-            parameter._get_internal_min_value()
-            for parameter in list(self.parameters.values())
-        ]
-        maxima = [
-            parameter._get_internal_max_value()
-            for parameter in list(self.parameters.values())
-        ]
+        # None boundaries become nan thanks to the casting to float
+
+        minima = np.array(
+            [
+                parameter._get_internal_min_value()
+                for parameter in list(self.parameters.values())
+            ],
+            float,
+        )
+        maxima = np.array(
+            [
+                parameter._get_internal_max_value()
+                for parameter in list(self.parameters.values())
+            ],
+            float,
+        )
 
         # Check whether some of the minima or of the maxima are None. If they are, set them
         # to a value 1000 times smaller or larger respectively than the best fit.
         # An error of 3 orders of magnitude is not interesting in general, and this is the only
         # way to be able to compute a derivative numerically
 
-        for i in range(len(minima)):
-
-            if minima[i] is None:
+        best_fit_array = np.array(best_fit_values, float)
 
-                minima[i] = best_fit_values[i] / 1000.0
-
-            if maxima[i] is None:
-
-                maxima[i] = best_fit_values[i] * 1000.0
-
-        # Transform them in np.array
-
-        minima = np.array(minima)
-        maxima = np.array(maxima)
+        minima = np.where(np.isnan(minima), best_fit_array / 1000.0, minima)
+        maxima = np.where(np.isnan(maxima), best_fit_array * 1000.0, maxima)
 
         try:
 
@@ -860,42 +852,69 @@ class Minimizer(object):
 
             n_dim = len(best_fit_values)
 
-            return np.zeros((n_dim, n_dim)) * np.nan
+            return np.full((n_dim, n_dim), np.nan)
+
+        # Invert it to get the covariance matrix. The Hessian at the minimum must be positive
+        # definite (unless there have been numerical problems, which can happen when some parameter
+        # is unconstrained), so we first try the Cholesky decomposition, which is both faster and
+        # more stable than a general inversion, and doubles as the positive-definiteness check
 
-        # Invert it to get the covariance matrix
+        n_dim = len(best_fit_values)
 
         try:
 
-            covariance_matrix = np.linalg.inv(hessian_matrix)
+            cholesky_factor = scipy.linalg.cho_factor(hessian_matrix, lower=True)
 
-        except:
+        except (np.linalg.LinAlgError, ValueError):
 
-            log.warning(
-                "Cannot invert Hessian matrix, looks like the matrix is singular"
+            # ValueError is raised for non-finite Hessians, which are left to the general inversion
+            # below as before
+
+            pass
+
+        else:
+
+            # the identity is only a scratch right-hand side, so LAPACK can overwrite it with the result
+
+            return scipy.linalg.cho_solve(
+                cholesky_factor, np.eye(n_dim), overwrite_b=True
             )
 
-            n_dim = len(best_fit_values)
+        # The smallest eigenvalue tells the user how far the Hessian is from being positive definite
+
+        if np.all(np.isfinite(hessian_matrix)):
+
+            eigenvalue_info = (
+                " (smallest eigenvalue of the Hessian matrix: %s)"
+                % np.linalg.eigvalsh(hessian_matrix)[0]
+            )
 
-            return np.zeros((n_dim, n_dim)) * np.nan
+        else:
 
-        # Now check that the covariance matrix is semi-positive definite (it must be unless
-        # there have been numerical problems, which can happen when some parameter is unconstrained)
+            eigenvalue_info = " (the Hessian matrix is not finite)"
 
-        # The fastest way is to try and compute the Cholesky decomposition, which
-        # works only if the matrix is positive definite
+        # Fall back on the general inversion, so that the user still gets the (non-positive
+        # definite) covariance matrix
 
         try:
 
-            _ = np.linalg.cholesky(covariance_matrix)
+            covariance_matrix = np.linalg.inv(hessian_matrix)
 
-        except:
+        except np.linalg.LinAlgError:
 
             log.warning(
-                "Covariance matrix is NOT semi-positive definite. Cannot estimate errors. This can "
-                "happen for many reasons, the most common being one or more unconstrained parameters"
-
+                "Cannot invert Hessian matrix, looks like the matrix is singular%s"
+                % eigenvalue_info
             )
 
+            return np.full((n_dim, n_dim), np.nan)
+
+        log.warning(
+            "Covariance matrix is NOT semi-positive definite. Cannot estimate errors. This can "
+            "happen for many reasons, the most common being one or more unconstrained parameters%s"
+            % eigenvalue_info
+        )
+
         return covariance_matrix
 
     def _get_one_error(self, parameter_name, target_delta_log_like, sign=-1):
@@ -993,6 +1012,11 @@ class Minimizer(object):
             # Instance the profile likelihood function
             pl = ProfileLikelihood(self, [parameter_name])
 
+            # Keep track of the profile likelihood at the previous trial, so that the bracket does not
+            # need to be evaluated again by the root finder
+
+            previous_log_like = self._m_log_like_minimum
+
             for i, trial in enumerate(trials):
 
                 this_log_like = pl([trial])
@@ -1031,10 +1055,17 @@ class Minimizer(object):
                     minimum_bound = min(bound1, bound2)
                     maximum_bound = max(bound1, bound2)
 
+                    known_log_likes = {
+                        bound1: this_log_like,
+                        bound2: previous_log_like,
+                    }
+
                     repeat = False
 
                     break
 
+                previous_log_like = this_log_like
+
             if repeat:
 
                 # We found a better minimum, restart from scratch
@@ -1058,10 +1089,22 @@ class Minimizer(object):
 
                 # Define the "biased likelihood", since brenq only finds zeros of function
 
-                biased_likelihood = (
-                    lambda x: pl(x) - self._m_log_like_minimum -
-                    target_delta_log_like
-                )
+                # (brentq starts by evaluating the ends of the bracket, which we already know, so
+                # avoid profiling the likelihood there again)
+
+                def biased_likelihood(x):
+
+                    if x in known_log_likes:
+
+                        this_log_like = known_log_likes[x]
+
+                    else:
+
+                        this_log_like = pl(x)
+
+                    return (
+                        this_log_like - self._m_log_like_minimum - target_delta_log_like
+                    )
 
                 try:
 
@@ -33,6 +33,7 @@ from threeML.io.rich_display import display
 from threeML.plugin_prototype import PluginPrototype
 from threeML.plugins.XYLike import XYLike
 from threeML.utils.binner import Rebinner
+from threeML.utils.integration import batched_simps, interleave
 from threeML.utils.spectrum.binned_spectrum import (
     BinnedSpectrum,
     ChannelSet,
@@ -1195,47 +1196,11 @@ class SpectrumLike(PluginPrototype):
 
         else:
 
-            for arg in args:
+            # translate all the ranges at once
 
-                selections = dash_separated_string_to_tuple(arg)
+            channel_ranges = self._ranges_to_channels(args)
 
-                # We need to find out if it is a channel or and energy being requested
-
-                idx = np.empty(2, dtype=int)
-                for i, s in enumerate(selections):
-
-                    if s[0].lower() == "c":
-
-                        if not (
-                            int(s[1:]) <= self._observed_spectrum.n_channels
-                        ):
-
-                            log.error(
-                                f"%s is larger than the number of channels: %d"
-                                % (
-                                    s,
-                                    self._observed_spectrum.n_channels,
-                                )
-                            )
-
-                            raise RuntimeError()
-
-                        idx[i] = int(s[1:])
-
-                    else:
-
-                        idx[i] = self._observed_spectrum.containing_bin(
-                            float(s)
-                        )
-
-                if not idx[0] < idx[1]:
-
-                    log.error(
-                        "The channel and energy selection (%s) are out of order and translates to %s-%s"
-                        % (selections, idx[0], idx[1])
-                    )
-
-                    raise RuntimeError()
+            for arg, idx in zip(args, channel_ranges):
 
                 # we do the opposite of the exclude command!
                 self._mask[idx[0] : idx[1] + 1] = True
@@ -1253,46 +1218,9 @@ class SpectrumLike(PluginPrototype):
 
             exclude = list(kwargs.pop("exclude"))
 
-            for arg in exclude:
-
-                selections = dash_separated_string_to_tuple(arg)
-
-                # We need to find out if it is a channel or and energy being requested
-
-                idx = np.empty(2, dtype=int)
-                for i, s in enumerate(selections):
-
-                    if s[0].lower() == "c":
+            channel_ranges = self._ranges_to_channels(exclude)
 
-                        if not (
-                            int(s[1:]) <= self._observed_spectrum.n_channels
-                        ):
-
-                            log.error(
-                                "%s is larger than the number of channels: %d"
-                                % (
-                                    s,
-                                    self._observed_spectrum.n_channels,
-                                )
-                            )
-
-                            raise RuntimeError()
-
-                        idx[i] = int(s[1:])
-
-                    else:
-
-                        idx[i] = self._observed_spectrum.containing_bin(
-                            float(s)
-                        )
-
-                if not idx[0] < idx[1]:
-
-                    log.error(
-                        "The channel and energy selection (%s) are out of order and translate to %s-%s"
-                        % (selections, idx[0], idx[1])
-                    )
-                    raise RuntimeError()
+            for arg, idx in zip(exclude, channel_ranges):
 
                 # we do the opposite of the exclude command!
                 self._mask[idx[0] : idx[1] + 1] = False
@@ -1325,11 +1253,9 @@ class SpectrumLike(PluginPrototype):
                 # we have more good channels than specified in the PHA file
                 # so we need to figure out which channels these are where excluded
 
-                deselected_channels = []
-                for i in range(self._observed_spectrum.n_channels):
-
-                    if self._observed_spectrum.quality.bad[i] and self._mask[i]:
-                        deselected_channels.append(i)
+                deselected_channels = np.flatnonzero(
+                    self._observed_spectrum.quality.bad & self._mask
+                )
 
                 log.warning(
                     "You have opted to use channels which are flagged BAD in the PHA file."
@@ -1340,6 +1266,74 @@ class SpectrumLike(PluginPrototype):
                     % (", ".join([str(ch) for ch in deselected_channels]))
                 )
 
+    def _ranges_to_channels(self, ranges) -> np.ndarray:
+        """
+        translate channel and/or energy ranges ('emin-emax', 'cmin-cmax'
+        or mixed) into the first and last channel they select. All the
+        energies are looked up in the spectrum bins with a single call
+
+        :param ranges: iterable of dash separated range strings
+        :returns: (n_ranges, 2) array of channel indices
+        """
+
+        selections = [dash_separated_string_to_tuple(arg) for arg in ranges]
+
+        idx = np.empty((len(selections), 2), dtype=int)
+
+        is_energy = np.zeros((len(selections), 2), dtype=bool)
+
+        energies = []
+
+        for j, selection in enumerate(selections):
+
+            # We need to find out if it is a channel or and energy being requested
+
+            for i, s in enumerate(selection):
+
+                if s[0].lower() == "c":
+
+                    if not (int(s[1:]) <= self._observed_spectrum.n_channels):
+
+                        log.error(
+                            "%s is larger than the number of channels: %d"
+                            % (
+                                s,
+                                self._observed_spectrum.n_channels,
+                            )
+                        )
+
+                        raise RuntimeError()
+
+                    idx[j, i] = int(s[1:])
+
+                else:
+
+                    is_energy[j, i] = True
+
+                    energies.append(float(s))
+
+        if energies:
+
+            # the energies were collected in the same row-major order
+            # in which the boolean index assigns them
+
+            idx[is_energy] = self._observed_spectrum.containing_bin(
+                np.array(energies)
+            )
+
+        for selection, (first, last) in zip(selections, idx):
+
+            if not first < last:
+
+                log.error(
+                    "The channel and energy selection (%s) are out of order and translates to %s-%s"
+                    % (selection, first, last)
+                )
+
+                raise RuntimeError()
+
+        return idx
+
     def _apply_mask_to_original_vectors(self):
 
         # Apply the mask
@@ -2140,14 +2134,16 @@ class SpectrumLike(PluginPrototype):
                         # e_edges = np.append(e1, e2[-1])
                         e_m = (e_edges[1:] + e_edges[:-1]) / 2.0
 
-                        diff_fluxes_edges = differential_flux(e_edges)
-                        diff_fluxes_mid = differential_flux(e_m)
+                        # evaluate the edges and the mid points with a single model call,
+                        # interleaved so that the model still sees an ordered energy grid
+
+                        diff_fluxes = differential_flux(interleave(e_edges, e_m))
 
                         return _simps(
                             e_edges[:-1],
                             e_edges[1:],
-                            diff_fluxes_edges,
-                            diff_fluxes_mid,
+                            diff_fluxes[0::2],
+                            diff_fluxes[1::2],
                         )
 
                 else:
@@ -2158,28 +2154,24 @@ class SpectrumLike(PluginPrototype):
 
                     e_m = (ee1 + ee2) / 2.0
 
+                    # the edges and the mid points are evaluated with a single model call,
+                    # interleaved so that the model still sees an ordered energy grid
+
+                    all_energies = interleave(e_edges, e_m)
+
                     def integral():
 
-                        diff_fluxes_edges = differential_flux(e_edges)
-                        diff_fluxes_mid = differential_flux(e_m)
+                        diff_fluxes = differential_flux(all_energies)
 
                         return _simps(
-                            ee1, ee2, diff_fluxes_edges, diff_fluxes_mid
+                            ee1, ee2, diff_fluxes[0::2], diff_fluxes[1::2]
                         )
 
             else:
 
                 def integral(e1, e2):
-                    # single energy values given
-                    return (
-                        (e2 - e1)
-                        / 6.0
-                        * (
-                            differential_flux(e1)
-                            + 4 * differential_flux((e2 + e1) / 2.0)
-                            + differential_flux(e2)
-                        )
-                    )
+
+                    return batched_simps(differential_flux, e1, e2)
 
         elif integrate_method == "trapz":
 
@@ -8,6 +8,7 @@ import numpy as np
 
 from threeML.io.logging import setup_logger
 from threeML.plugin_prototype import PluginPrototype
+from threeML.utils.integration import batched_simps
 
 __instrument_name = "n.a."
 
@@ -212,17 +213,8 @@ class UnbinnedPoissonLike(PluginPrototype):
         # New way with simpson rule.
         # Make sure to not calculate the model twice for the same energies
         def integral(e1, e2):
-            # Simpson's rule
-            # single energy values given
-            return (
-                (e2 - e1)
-                / 6.0
-                * (
-                    differential(e1)
-                    + 4 * differential((e2 + e1) / 2.0)
-                    + differential(e2)
-                )
-            )
+
+            return batched_simps(differential, e1, e2)
 
         return differential, integral
 
@@ -236,9 +228,12 @@ class UnbinnedPoissonLike(PluginPrototype):
 
         if self._observation.is_multi_interval:
 
-            for start, stop in zip(self._observation.start, self._observation.stop):
+            # integrate all the intervals with one model evaluation
 
-                n_expected_counts += self._integral_model(start, stop)
+            n_expected_counts += self._integral_model(
+                np.asarray(self._observation.start), np.asarray(
+                    self._observation.stop)
+            ).sum()
 
         else:
 
@@ -247,11 +242,8 @@ class UnbinnedPoissonLike(PluginPrototype):
             )
 
         M = self._model(self._observation.events)
-        negative_mask = M < 0
-        if negative_mask.sum() > 0:
-            M[negative_mask] = 0.0
 
-        # use numba to sum the events
+        # use numba to clip and sum the events in one pass
         sum_logM = _evaluate_logM_sum(M, self._n_events)
 
         minus_log_like = -n_expected_counts*self._dead_corr + sum_logM
@@ -277,19 +269,22 @@ class UnbinnedPoissonLike(PluginPrototype):
 def _evaluate_logM_sum(M, size):
     # Evaluate the logarithm with protection for negative or small
     # numbers, using a smooth linear extrapolation (better than just a sharp
-    # cutoff)
+    # cutoff). Negative model values are treated as zero. Everything is
+    # done in a single loop so no temporary arrays are needed
+
+    two_tiny = 2.0 * _tiny
+
+    log_tiny = np.log(_tiny)
 
-    non_tiny_mask = M > 2.0 * _tiny
+    sum_logM = 0.0
 
-    tink_mask = np.logical_not(non_tiny_mask)
+    for i in range(size):
 
-    if tink_mask.sum() > 0:
-        logM = np.zeros(size)
-        logM[tink_mask] = (np.abs(M[tink_mask])/_tiny) + np.log(_tiny) - 1
-        logM[non_tiny_mask] = np.log(M[non_tiny_mask])
+        m = max(M[i], 0.0)
 
-    else:
+        # only the selected term is evaluated, so an infinite model
+        # gives an infinite sum as in the masked version
 
-        logM = np.log(M)
+        sum_logM += np.log(m) if m > two_tiny else m / _tiny + log_tiny - 1
 
-    return logM.sum()
+    return sum_logM
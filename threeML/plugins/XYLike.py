@@ -14,8 +14,8 @@ from threeML.data_list import DataList
 from threeML.io.logging import setup_logger
 from threeML.io.package_data import get_path_of_data_file
 from threeML.plugin_prototype import PluginPrototype
-from threeML.utils.statistics.likelihood_functions import (
-    half_chi2, poisson_log_likelihood_ideal_bkg)
+from threeML.utils.statistics.likelihood_functions import (log_factorials,
+                                                           xlogy_one)
 
 plt.style.use(str(get_path_of_data_file("threeml.mplstyle")))
 
@@ -84,7 +84,9 @@ class XYLike(PluginPrototype):
             self._yerr = None
             self._has_errors = True
             self._y = self._y.astype(np.int64)
-            self._zeros = np.zeros_like(self._y)
+
+            # the counts are fixed, so their log factorials are computed once
+            self._log_factorial_y = log_factorials(self._y)
         # sets the exposure assuming eval at center
         # of bin. this should probably be improved
         # with a histogram plugin
@@ -395,14 +397,14 @@ class XYLike(PluginPrototype):
 
         if self._is_poisson:
 
-            # Poisson log-likelihood
-
-            negative_mask = expectation < 0
-            if negative_mask.sum() > 0:
-                expectation[negative_mask] = 0.0
+            # Poisson log-likelihood (negative expectations are clipped to
+            # zero inside the kernel)
 
-            return _poisson_like(self._y[self._mask], self._zeros, expectation * self._exposure
-                                 )
+            return _poisson_like(
+                self._y[self._mask],
+                self._log_factorial_y[self._mask],
+                expectation * self._exposure,
+            )
 
         else:
 
@@ -562,19 +564,41 @@ class XYLike(PluginPrototype):
 
 
 @nb.njit(fastmath=True)
-def _poisson_like(y, zeros, expectation):
-    return np.sum(
-        poisson_log_likelihood_ideal_bkg(
-            y, zeros, expectation
-        )[0]
-    )
+def _poisson_like(y, log_factorial_y, expectation):
+
+    # clip, evaluate and sum the poisson log-likelihood in a single pass
+    # without temporary arrays
+
+    n = expectation.shape[0]
+
+    log_like = 0.0
+
+    for i in range(n):
+
+        m = expectation[i]
+
+        if m < 0.0:
+
+            m = 0.0
+
+        log_like += xlogy_one(y[i], m) - m - log_factorial_y[i]
+
+    return log_like
 
 
 @nb.njit(fastmath=True)
 def _chi2_like(y, yerr, expectation):
 
-    chi2_ = half_chi2(y, yerr, expectation)
+    # this is minus half of a chi2, accumulated in a single pass
+
+    n = y.shape[0]
+
+    chi2_ = 0.0
+
+    for i in range(n):
+
+        chi2_ += (y[i] - expectation[i]) ** 2 / (yerr[i] ** 2)
 
-    assert np.all(np.isfinite(chi2_))
+    assert np.isfinite(chi2_)
 
-    return np.sum(chi2_) * (-1)
+    return -0.5 * chi2_
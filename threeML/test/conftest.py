@@ -1,3 +1,4 @@
+import copy
 import os
 import signal
 import subprocess
@@ -22,6 +23,7 @@ from threeML.utils.photometry import get_photometric_filter_library, Photometeri
 from threeML.plugins.UnbinnedPoissonLike import EventObservation
 from threeML.plugins.XYLike import XYLike
 from threeML.utils.numba_utils import VectorFloat64
+from threeML.utils.spectrum.pha_spectrum import PHASpectrum
 
 from threeML.io.logging import debug_mode
 
@@ -79,29 +81,54 @@ def get_test_datasets_directory():
     return Path(get_path_of_data_dir(), "datasets").absolute()
 
 
-def get_dataset():
+bn090217206_dir = Path(get_test_datasets_directory(), "bn090217206")
 
-    data_dir = Path(get_test_datasets_directory(), "bn090217206")
 
-    obs_spectrum = Path(data_dir, "bn090217206_n6_srcspectra.pha{1}")
-    bak_spectrum = Path(data_dir, "bn090217206_n6_bkgspectra.bak{1}")
-    rsp_file = Path(data_dir, "bn090217206_n6_weightedrsp.rsp{1}")
-    NaI6 = OGIPLike("NaI6", str(obs_spectrum),
-                    str(bak_spectrum), str(rsp_file))
+def read_spectra_det(det):
+
+    obs_spectrum = Path(bn090217206_dir, f"bn090217206_{det}_srcspectra.pha{{1}}")
+    bak_spectrum = Path(bn090217206_dir, f"bn090217206_{det}_bkgspectra.bak{{1}}")
+    rsp_file = Path(bn090217206_dir, f"bn090217206_{det}_weightedrsp.rsp{{1}}")
+
+    pha = PHASpectrum(str(obs_spectrum), file_type="observed",
+                      rsp_file=str(rsp_file))
+    bak = PHASpectrum(str(bak_spectrum), file_type="background",
+                      rsp_file=pha.response)
+
+    return pha, bak
+
+
+@pytest.fixture(scope="session")
+def bn090217206_spectra():
+
+    # the NaI6 files are used by both the NaI6 and the NaI6+NaI9+BGO1 data
+    # lists, so read the files of each detector only once per session. Every
+    # plugin gets its own copy, as the plugins set their model on the response
+
+    spectra = {}
+
+    def get_spectra(det):
+
+        if det not in spectra:
+
+            spectra[det] = read_spectra_det(det)
+
+        return copy.deepcopy(spectra[det])
+
+    return get_spectra
+
+
+def get_dataset(get_spectra):
+
+    NaI6 = OGIPLike("NaI6", *get_spectra("n6"))
     NaI6.set_active_measurements("10.0-30.0", "40.0-950.0")
 
     return NaI6
 
 
-def get_dataset_det(det):
-
-    data_dir = Path(get_test_datasets_directory(), "bn090217206")
+def get_dataset_det(det, get_spectra):
 
-    obs_spectrum = Path(data_dir, f"bn090217206_{det}_srcspectra.pha{{1}}")
-    bak_spectrum = Path(data_dir, f"bn090217206_{det}_bkgspectra.bak{{1}}")
-    rsp_file = Path(data_dir, f"bn090217206_{det}_weightedrsp.rsp{{1}}")
-    p = OGIPLike(det, str(obs_spectrum),
-                 str(bak_spectrum), str(rsp_file))
+    p = OGIPLike(det, *get_spectra(det))
     if det[0] == "b":
         p.set_active_measurements("250-25000")
     else:
@@ -111,9 +138,9 @@ def get_dataset_det(det):
 
 
 @pytest.fixture(scope="session")
-def data_list_bn090217206_nai6():
+def data_list_bn090217206_nai6(bn090217206_spectra):
 
-    NaI6 = get_dataset()
+    NaI6 = get_dataset(bn090217206_spectra)
 
     data_list = DataList(NaI6)
 
@@ -121,12 +148,12 @@ def data_list_bn090217206_nai6():
 
 
 @pytest.fixture(scope="session")
-def data_list_bn090217206_nai6_nai9_bgo1():
+def data_list_bn090217206_nai6_nai9_bgo1(bn090217206_spectra):
 
     p_list = []
-    p_list.append(get_dataset_det("n6"))
-    p_list.append(get_dataset_det("n9"))
-    p_list.append(get_dataset_det("b1"))
+    p_list.append(get_dataset_det("n6", bn090217206_spectra))
+    p_list.append(get_dataset_det("n9", bn090217206_spectra))
+    p_list.append(get_dataset_det("b1", bn090217206_spectra))
 
     data_list = DataList(*p_list)
 
@@ -1,4 +1,17 @@
+import ctypes
+
 from threeML import BayesianAnalysis, Uniform_prior, Log_uniform_prior
+from threeML.bayesian.sampler_base import UnitCubeSampler
+from threeML.data_list import DataList
+from threeML.plugins.XYLike import XYLike
+from astromodels import (
+    Line,
+    Model,
+    PointSource,
+    Powerlaw,
+    Quadratic,
+    Truncated_gaussian,
+)
 import numpy as np
 import pytest
 
@@ -278,3 +291,185 @@ def test_bayes_shared(fitted_joint_likelihood_bn090217206_nai6_nai9_bgo1):
         res_not_shared["value"]["bn090217206.spectrum.main.Powerlaw.index"],
         rtol=0.1,
     )
+
+
+def make_line_analysis():
+
+    x = np.linspace(0, 10, 20)
+
+    xy = XYLike("line", x, 1.0 + 2.0 * x, yerr=np.ones_like(x))
+
+    line = Line()
+
+    line.a.prior = Uniform_prior(lower_bound=-10.0, upper_bound=10.0)
+    line.b.prior = Log_uniform_prior(lower_bound=0.1, upper_bound=10.0)
+
+    model = Model(PointSource("line", 0, 0, spectral_shape=line))
+
+    return line, model, DataList(xy)
+
+
+def test_starting_points():
+
+    line, model, data_list = make_line_analysis()
+
+    line.a.bounds = (-10.0, 10.0)
+    line.a.value = 1.0
+
+    # a parameter sitting exactly on its boundary
+
+    line.b.bounds = (0.1, 10.0)
+    line.b.value = 0.1
+
+    bayes = BayesianAnalysis(model, data_list)
+
+    bayes.set_sampler("emcee")
+
+    p0 = bayes.sampler._get_starting_points(20)
+
+    assert p0.shape == (20, 2)
+
+    # the walkers must stay inside the bounds and all be different
+
+    assert np.all((p0[:, 0] >= -10.0) & (p0[:, 0] <= 10.0))
+    assert np.all((p0[:, 1] >= 0.1) & (p0[:, 1] <= 10.0))
+
+    assert np.unique(p0[:, 0]).size == 20
+    assert np.unique(p0[:, 1]).size == 20
+
+    # a bounded parameter which is exactly zero cannot be randomized
+
+    line.a.value = 0.0
+
+    with pytest.raises(AssertionError):
+
+        bayes.sampler._get_starting_points(20)
+
+
+class _UnitCubeSampler(UnitCubeSampler):
+
+    # only the posterior construction is tested, no sampler package is needed
+
+    def setup(self):
+        pass
+
+    def sample(self):
+        pass
+
+
+def test_unit_cube_transforms():
+
+    x = np.linspace(0, 10, 20)
+
+    xy = XYLike("quadratic", x, 1.0 + 2.0 * x + 0.3 * x ** 2, yerr=np.ones_like(x))
+
+    quadratic = Quadratic()
+
+    # the closed form uniform and log uniform transforms and a scalar one
+
+    quadratic.a.prior = Uniform_prior(lower_bound=-10.0, upper_bound=10.0)
+    quadratic.b.prior = Log_uniform_prior(lower_bound=0.1, upper_bound=10.0)
+    quadratic.c.prior = Truncated_gaussian(
+        mu=0.3, sigma=0.5, lower_bound=-1.0, upper_bound=1.0
+    )
+
+    model = Model(PointSource("quadratic", 0, 0, spectral_shape=quadratic))
+
+    bayes = BayesianAnalysis(model, DataList(xy))
+
+    sampler = _UnitCubeSampler(bayes._likelihood_model, bayes._data_list)
+
+    priors = [quadratic.a.prior, quadratic.b.prior, quadratic.c.prior]
+
+    np.random.seed(1234)
+
+    cubes = np.random.uniform(0, 1, size=(10, 3))
+
+    loglike, prior = sampler._construct_unitcube_posterior(return_copy=True)
+
+    for cube in cubes:
+
+        expected = [p.from_unit_cube(u) for p, u in zip(priors, cube)]
+
+        params = prior(cube)
+
+        np.testing.assert_allclose(params, expected)
+
+        # the returned points are kept, so they must not be overwritten
+
+        assert params is not prior(cube)
+
+        # the likelihood assigns the trial values to the parameters
+
+        loglike(params)
+
+        np.testing.assert_allclose(
+            [quadratic.a.value, quadratic.b.value, quadratic.c.value], params
+        )
+
+    # the in-place transform of the ctypes buffer multinest hands over
+
+    _, prior = sampler._construct_unitcube_posterior(return_copy=False)
+
+    for cube in cubes:
+
+        expected = [p.from_unit_cube(u) for p, u in zip(priors, cube)]
+
+        buffer = (ctypes.c_double * 3)(*cube)
+
+        prior(buffer, 3, 3)
+
+        np.testing.assert_allclose(list(buffer), expected)
+
+
+def test_posterior_assigns_trial_values():
+
+    line, model, data_list = make_line_analysis()
+
+    bayes = BayesianAnalysis(model, data_list)
+
+    bayes.set_sampler("emcee")
+
+    log_posterior = bayes.sampler.get_posterior([1.5, 2.5])
+
+    # the cached setters work like assignments of the value property
+
+    assert line.a.value == 1.5
+    assert line.b.value == 2.5
+
+    expected = (
+        data_list["line"].get_log_like()
+        + np.log(line.a.prior(1.5))
+        + np.log(line.b.prior(2.5))
+    )
+
+    np.testing.assert_allclose(log_posterior, expected)
+
+    # a point outside of the support of a prior is rejected
+
+    assert bayes.sampler.get_posterior([1.5, 20.0]) == -np.inf
+
+    # the setter also goes through the transformation of the parameter,
+    # e.g. the logarithmic one of the normalization of a power law
+
+    x = np.logspace(0, 2, 20)
+
+    xy = XYLike("powerlaw", x, 2.0 * x ** -1.5, yerr=0.1 * x ** -1.5)
+
+    powerlaw = Powerlaw()
+
+    powerlaw.K.prior = Log_uniform_prior(lower_bound=0.1, upper_bound=10.0)
+    powerlaw.index.prior = Uniform_prior(lower_bound=-3.0, upper_bound=0.0)
+
+    model = Model(PointSource("powerlaw", 0, 0, spectral_shape=powerlaw))
+
+    bayes = BayesianAnalysis(model, DataList(xy))
+
+    bayes.set_sampler("emcee")
+
+    bayes.sampler.get_posterior([0.5, -1.2])
+
+    assert powerlaw.K.value == pytest.approx(0.5)
+    assert powerlaw.K._get_internal_value() == pytest.approx(np.log10(0.5))
+
+    assert powerlaw.index.value == -1.2
@@ -8,6 +8,7 @@ from .conftest import get_test_datasets_directory
 from threeML.io.file_utils import within_directory
 from threeML.utils.time_interval import TimeIntervalSet
 from threeML.utils.time_series.event_list import EventListWithDeadTime, EventList
+from threeML.utils.time_series.polynomial import Polynomial
 
 __this_dir__ = os.path.join(os.path.abspath(os.path.dirname(__file__)))
 datasets_dir = get_test_datasets_directory()
@@ -126,3 +127,124 @@ def test_binned_fit(event_time_series):
     assert evt_list._poly_counts.sum() > 0
 
     evt_list.__repr__()
+
+
+def test_mixed_polynomial_degrees():
+
+    dummy_times = np.linspace(0, 10, 10)
+
+    evt_list = EventList(
+        arrival_times=dummy_times,
+        measurement=np.zeros_like(dummy_times),
+        n_channels=2,
+        start_time=0,
+        stop_time=10,
+    )
+
+    # the channel integrals are contracted together, which needs a common degree
+
+    evt_list._polynomials = [Polynomial([1.0]), Polynomial([1.0, 0.5])]
+
+    with pytest.raises(RuntimeError):
+        evt_list.get_total_poly_count(0, 1)
+
+    with pytest.raises(RuntimeError):
+        evt_list.get_total_poly_error(0, 1)
+
+
+def _make_channel_event_list(n_channels=3):
+
+    np.random.seed(1234)
+
+    arrival_times = np.sort(np.random.uniform(0.0, 100.0, size=3000))
+
+    measurement = np.random.randint(0, n_channels, size=arrival_times.shape[0])
+
+    evt_list = EventListWithDeadTime(
+        arrival_times=arrival_times,
+        measurement=measurement,
+        n_channels=n_channels,
+        start_time=0.0,
+        stop_time=100.0,
+        dead_time=np.zeros_like(arrival_times),
+    )
+
+    return evt_list, arrival_times, measurement
+
+
+@pytest.mark.parametrize("unbinned", [True, False])
+def test_selection_matches_channel_loop(unbinned):
+
+    n_channels = 3
+
+    evt_list, arrival_times, measurement = _make_channel_event_list(n_channels)
+
+    evt_list.poly_order = 1
+
+    evt_list.set_background_interval("0-40", "60-100", unbinned=unbinned)
+
+    evt_list.set_active_time_intervals("10.-20.", "45.-55.")
+
+    intervals = [(10.0, 20.0), (45.0, 55.0)]
+
+    time_mask = np.zeros_like(arrival_times, dtype=bool)
+
+    for tmin, tmax in intervals:
+
+        time_mask |= (tmin <= arrival_times) & (arrival_times <= tmax)
+
+    # the per channel loops of the original implementation
+
+    expected_counts = np.array(
+        [np.sum((measurement == chan) & time_mask) for chan in range(n_channels)]
+    )
+
+    expected_poly_counts = np.array(
+        [
+            sum(poly.integral(tmin, tmax) for tmin, tmax in intervals)
+            for poly in evt_list.polynomials
+        ]
+    )
+
+    expected_poly_err = np.array(
+        [
+            np.sqrt(
+                sum(poly.integral_error(tmin, tmax) ** 2 for tmin, tmax in intervals)
+            )
+            for poly in evt_list.polynomials
+        ]
+    )
+
+    np.testing.assert_array_equal(evt_list._counts, expected_counts)
+
+    np.testing.assert_allclose(
+        evt_list._poly_counts, expected_poly_counts, rtol=1e-10
+    )
+
+    np.testing.assert_allclose(
+        evt_list._poly_count_err, expected_poly_err, rtol=1e-10
+    )
+
+    # the background should be close to the flat simulated rate
+
+    np.testing.assert_allclose(evt_list._poly_counts, 200.0, rtol=0.25)
+
+    for tmin, tmax in intervals:
+
+        counts = evt_list.count_per_channel_over_interval(tmin, tmax)
+
+        selection = (tmin <= arrival_times) & (arrival_times <= tmax)
+
+        expected = np.array(
+            [
+                len(arrival_times[(measurement == chan) & selection])
+                for chan in range(n_channels)
+            ],
+            dtype=float,
+        )
+
+        assert counts.dtype == expected.dtype
+
+        np.testing.assert_array_equal(counts, expected)
+
+        assert evt_list.counts_over_interval(tmin, tmax) == selection.sum()
@@ -1,5 +1,4 @@
 import os
-from builtins import zip
 
 import astropy.units as u
 import matplotlib.pyplot as plt
@@ -7,16 +6,11 @@ import pytest
 
 from threeML import *
 from threeML.io.calculate_flux import _calculate_point_source_flux
-from threeML.io.package_data import get_path_of_data_dir
 from threeML.plugins.OGIPLike import OGIPLike
 from threeML.utils.fitted_objects.fitted_point_sources import InvalidUnitError
 
 # Init some globals
 
-datadir = os.path.abspath(
-    os.path.join(get_path_of_data_dir(), "datasets", "bn090217206")
-)
-
 good_d_flux_units = ["1/(cm2 s keV)", "erg/(cm2 s keV)", "erg2/(cm2 s keV)"]
 
 good_i_flux_units = ["1/(cm2 s )", "erg/(cm2 s )", "erg2/(cm2 s )"]
@@ -28,6 +22,31 @@ good_energy_units = ["keV", "Hz", "nm"]
 bad_flux_units = ["g"]
 
 
+# the fits run by the analysis_to_test fixture, in the order it returns them
+
+analysis_names = [
+    "jl_simple",
+    "jl_complex",
+    "jl_dless",
+    "bayes_simple",
+    "bayes_complex",
+    "bayes_dless",
+]
+
+
+# the samples are only used to exercise the plotting and flux code, so allow
+# shorter chains for quick runs (emcee needs at least twice as many walkers as
+# free parameters)
+
+if os.environ.get("THREEML_TEST_QUICK"):
+
+    sampler_setup = dict(n_iterations=4, n_burn_in=2, n_walkers=10)
+
+else:
+
+    sampler_setup = dict(n_iterations=10, n_burn_in=10, n_walkers=20)
+
+
 def make_simple_model():
 
     triggerName = "bn090217206"
@@ -81,7 +100,9 @@ def make_dless_components_model():
     return model
 
 
-@pytest.fixture
+# fitting and sampling is by far the most expensive part of this module, and the tests
+# below only read the results, so do it once for all of them
+@pytest.fixture(scope="module")
 def analysis_to_test(data_list_bn090217206_nai6):
 
     simple_model = make_simple_model()
@@ -106,14 +127,14 @@ def analysis_to_test(data_list_bn090217206_nai6):
     bayes_simple = BayesianAnalysis(simple_model, data_list_bn090217206_nai6)
 
     bayes_simple.set_sampler("emcee")
-    bayes_simple.sampler.setup(n_iterations=10, n_burn_in=10, n_walkers=20)
+    bayes_simple.sampler.setup(**sampler_setup)
     bayes_simple.sample()
 
     bayes_complex = BayesianAnalysis(complex_model, data_list_bn090217206_nai6)
 
     bayes_complex.set_sampler("emcee")
 
-    bayes_complex.sampler.setup(n_iterations=10, n_burn_in=10, n_walkers=20)
+    bayes_complex.sampler.setup(**sampler_setup)
 
     bayes_complex.sample()
 
@@ -121,23 +142,28 @@ def analysis_to_test(data_list_bn090217206_nai6):
 
     bayes_dless.set_sampler("emcee")
 
-    bayes_dless.sampler.setup(n_iterations=10, n_burn_in=10, n_walkers=20)
+    bayes_dless.sampler.setup(**sampler_setup)
 
     bayes_dless.sample()
 
-    analysis_to_test = [
-        jl_simple.results,
-        jl_complex.results,
-        jl_dless.results,
-        bayes_simple.results,
-        bayes_complex.results,
-        bayes_dless.results,
-    ]
+    analysis_to_test = {
+        "jl_simple": jl_simple.results,
+        "jl_complex": jl_complex.results,
+        "jl_dless": jl_dless.results,
+        "bayes_simple": bayes_simple.results,
+        "bayes_complex": bayes_complex.results,
+        "bayes_dless": bayes_dless.results,
+    }
+
+    assert list(analysis_to_test) == analysis_names
 
     return analysis_to_test
 
 
-def test_fitted_point_source_plotting(analysis_to_test):
+@pytest.mark.parametrize("u1,u2", list(zip(good_d_flux_units, good_i_flux_units)))
+@pytest.mark.parametrize("e_unit", good_energy_units)
+@pytest.mark.parametrize("analysis_name", analysis_names)
+def test_fitted_point_source_plotting(analysis_to_test, u1, u2, e_unit, analysis_name):
 
     plot_keywords = {
         "use_components": True,
@@ -157,22 +183,16 @@ def test_fitted_point_source_plotting(analysis_to_test):
         "sum_sources": True,
     }
 
-    for u1, u2 in zip(good_d_flux_units, good_i_flux_units):
+    x = analysis_to_test[analysis_name]
 
-        for e_unit in good_energy_units:
+    _ = plot_spectra(x, flux_unit=u1, energy_unit=e_unit, num_ene=5)
 
-            for x in analysis_to_test:
+    _ = plot_spectra(x, **plot_keywords)
 
-                _ = plot_spectra(
-                    x, flux_unit=u1, energy_unit=e_unit, num_ene=5
-                )
+    with pytest.raises(InvalidUnitError):
+        _ = plot_spectra(x, flux_unit=bad_flux_units[0])
 
-                _ = plot_spectra(x, **plot_keywords)
-
-                with pytest.raises(InvalidUnitError):
-                    _ = plot_spectra(x, flux_unit=bad_flux_units[0])
-
-            plt.close("all")
+    plt.close("all")
 
 
 def test_fitted_point_source_flux_calculations(analysis_to_test):
@@ -187,20 +207,28 @@ def test_fitted_point_source_flux_calculations(analysis_to_test):
     }
 
     _calculate_point_source_flux(
-        1, 10, analysis_to_test[0], flux_unit=good_i_flux_units[0], energy_unit="keV"
+        1,
+        10,
+        analysis_to_test["jl_simple"],
+        flux_unit=good_i_flux_units[0],
+        energy_unit="keV",
     )
 
-    _calculate_point_source_flux(1, 10, analysis_to_test[-2], **flux_keywords)
+    _calculate_point_source_flux(
+        1, 10, analysis_to_test["bayes_complex"], **flux_keywords
+    )
 
 
 def test_units_on_energy_range(analysis_to_test):
 
     _ = plot_spectra(
-        analysis_to_test[0], ene_min=1.0 * u.keV, ene_max=1 * u.MeV
+        analysis_to_test["jl_simple"], ene_min=1.0 * u.keV, ene_max=1 * u.MeV
     )
 
     with pytest.raises(RuntimeError):
-        plot_spectra(analysis_to_test[0], ene_min=1.0, ene_max=1 * u.MeV)
+        plot_spectra(analysis_to_test["jl_simple"], ene_min=1.0, ene_max=1 * u.MeV)
 
     with pytest.raises(RuntimeError):
-        plot_spectra(analysis_to_test[0], ene_min=1.0 * u.keV, ene_max=1.0)
+        plot_spectra(
+            analysis_to_test["jl_simple"], ene_min=1.0 * u.keV, ene_max=1.0
+        )
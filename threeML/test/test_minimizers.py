@@ -3,8 +3,12 @@ import numpy as np
 
 from threeML import LocalMinimization, GlobalMinimization
 from threeML import parallel_computation
+from threeML import DataList, JointLikelihood
+from threeML.minimizer import minimization
+from threeML.minimizer.minimization import ProfileLikelihood
+from threeML.plugins.XYLike import XYLike
 
-from astromodels import clone_model
+from astromodels import clone_model, Line, Model, PointSource
 
 try:
 
@@ -166,3 +170,99 @@ def test_scipy(joint_likelihood_bn090217206_nai):
     )
 
     do_analysis(joint_likelihood_bn090217206_nai, minim)
+
+
+def fit_line():
+
+    np.random.seed(1234)
+
+    x = np.linspace(0, 10, 20)
+
+    y = 1.0 + 2.0 * x + np.random.normal(0, 1, size=x.shape[0])
+
+    xy = XYLike("line", x, y, yerr=np.ones_like(x))
+
+    model = Model(PointSource("line", 0, 0, spectral_shape=Line()))
+
+    jl = JointLikelihood(model, DataList(xy))
+
+    jl.set_minimizer(LocalMinimization("scipy"))
+
+    jl.fit()
+
+    return jl, x
+
+
+def test_profile_likelihood_errors(monkeypatch):
+
+    jl, x = fit_line()
+
+    # record the points where the likelihood gets profiled
+
+    profiled = []
+
+    original_call = ProfileLikelihood.__call__
+
+    def recording_call(self, values):
+
+        profiled.append(float(np.squeeze(values)))
+
+        return original_call(self, values)
+
+    monkeypatch.setattr(ProfileLikelihood, "__call__", recording_call)
+
+    errors = jl.get_errors()
+
+    # the model is linear and the errors gaussian, so the profile likelihood
+    # errors are the parabolic ones
+
+    design = np.vstack([np.ones_like(x), x]).T
+
+    expected = np.sqrt(np.diag(np.linalg.inv(design.T.dot(design))))
+
+    np.testing.assert_allclose(
+        -errors["negative_error"].values, expected, rtol=1e-3
+    )
+    np.testing.assert_allclose(
+        errors["positive_error"].values, expected, rtol=1e-3
+    )
+
+    # the root finder reuses the ends of the bracket instead of profiling them again
+
+    assert len(profiled) == len(set(profiled))
+
+
+@pytest.mark.parametrize(
+    "hessian,warning",
+    [
+        ([[1.0, 0.0], [0.0, -1.0]], "NOT semi-positive definite"),
+        ([[1.0, 1.0], [1.0, 1.0]], "Cannot invert Hessian matrix"),
+    ],
+)
+def test_covariance_of_bad_hessian(monkeypatch, hessian, warning):
+
+    jl, _ = fit_line()
+
+    best_fit_values = [p.value for p in jl.minimizer.parameters.values()]
+
+    monkeypatch.setattr(
+        minimization, "get_hessian", lambda *args: np.array(hessian)
+    )
+
+    warnings = []
+
+    monkeypatch.setattr(minimization.log, "warning", warnings.append)
+
+    covariance = jl.minimizer._compute_covariance_matrix(best_fit_values)
+
+    # a single warning, telling how far from positive definite the Hessian is
+
+    assert len(warnings) == 1
+
+    assert warning in warnings[0]
+
+    smallest_eigenvalue = np.linalg.eigvalsh(hessian)[0]
+
+    assert "smallest eigenvalue of the Hessian matrix: %s" % smallest_eigenvalue in warnings[0]
+
+    assert covariance.shape == (2, 2)
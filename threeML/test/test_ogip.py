@@ -596,3 +596,79 @@ def test_likelihood_functions():
     npt.assert_almost_equal(test, (-2.99750018, 5.0), decimal=4)
 
     # assert test == (-2.99750018, 5.0)
+
+
+def test_precalc_likelihood_functions():
+
+    from scipy.special import gammaln
+    from scipy.stats import norm, poisson
+
+    obs_cnts = np.array([0, 3, 10, 25])
+    obs_bkg = np.array([0, 2, 5, 30])
+    bkg_err = np.array([0.0, 1.4, 2.2, 5.5])
+    exp_cnts = np.array([0.5, 2.0, 5.0, 20.0])
+    exp_bkg = np.array([0.0, 1.0, 5.0, 7.5])
+    ratio = 0.8
+
+    log_fact_obs = log_factorials(obs_cnts)
+    log_fact_bkg = log_factorials(obs_bkg)
+
+    npt.assert_allclose(log_fact_obs, gammaln(obs_cnts + 1))
+    npt.assert_allclose(log_fact_bkg, gammaln(obs_bkg + 1))
+
+    # the precomputed factorials must give the same likelihoods as the wrappers
+
+    ll, b = poisson_log_likelihood_ideal_bkg_precalc(
+        obs_cnts, exp_bkg, exp_cnts, log_fact_obs
+    )
+
+    ll_ref, b_ref = poisson_log_likelihood_ideal_bkg(obs_cnts, exp_bkg, exp_cnts)
+
+    npt.assert_allclose(ll, ll_ref)
+    npt.assert_allclose(b, b_ref)
+
+    npt.assert_allclose(ll, poisson.logpmf(obs_cnts, exp_cnts + exp_bkg))
+
+    ll, b = poisson_observed_poisson_background_precalc(
+        obs_cnts, obs_bkg, ratio, exp_cnts, log_fact_obs, log_fact_bkg
+    )
+
+    ll_ref, b_ref = poisson_observed_poisson_background(
+        obs_cnts, obs_bkg, ratio, exp_cnts
+    )
+
+    npt.assert_allclose(ll, ll_ref)
+    npt.assert_allclose(b, b_ref)
+
+    # at the profiled background this is the product of the two poissonians
+
+    npt.assert_allclose(
+        ll,
+        poisson.logpmf(obs_cnts, exp_cnts + b)
+        + poisson.logpmf(obs_bkg, b / ratio),
+    )
+
+    ll, b = poisson_observed_gaussian_background_precalc(
+        obs_cnts, obs_bkg, bkg_err, exp_cnts, log_fact_obs
+    )
+
+    ll_ref, b_ref = poisson_observed_gaussian_background(
+        obs_cnts, obs_bkg, bkg_err, exp_cnts
+    )
+
+    npt.assert_allclose(ll, ll_ref)
+    npt.assert_allclose(b, b_ref)
+
+    # and the poissonian times the gaussian background, where there is some
+
+    has_bkg = obs_bkg > 0
+
+    npt.assert_allclose(
+        ll[has_bkg],
+        poisson.logpmf(obs_cnts, exp_cnts + b)[has_bkg]
+        + norm.logpdf(b[has_bkg], obs_bkg[has_bkg], bkg_err[has_bkg]),
+    )
+
+    npt.assert_allclose(
+        ll[~has_bkg], poisson.logpmf(obs_cnts, exp_cnts)[~has_bkg]
+    )
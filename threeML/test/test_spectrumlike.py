@@ -9,6 +9,7 @@ from threeML.plugins.SpectrumLike import SpectrumLike
 from threeML.plugins.OGIPLike import OGIPLike
 from threeML.utils.OGIP.response import OGIPResponse
 from threeML.exceptions.custom_exceptions import NegativeBackground
+from threeML.utils.integration import batched_simps
 from threeML.io.file_utils import within_directory
 from .conftest import get_test_datasets_directory
 import warnings
@@ -376,3 +377,135 @@ def test_all_statistics():
     spectrum_generator.set_model(model)
 
     spectrum_generator.get_log_like()
+
+
+class _TableModel(object):
+    """
+    a stand-in for a tabulated (non analytic) model, which interpolates its table
+    and, like the table models, requires the energies to be an increasing grid
+    """
+
+    def __init__(self):
+
+        self._log_energies = np.log(np.logspace(0, 4, 17))
+        self._fluxes = np.random.uniform(1.0, 10.0, 17)
+
+    def flux(self, energies):
+
+        assert np.all(np.diff(energies) > 0)
+
+        return np.interp(np.log(energies), self._log_energies, self._fluxes)
+
+    def get_number_of_point_sources(self):
+
+        return 1
+
+    def get_point_source_fluxes(self, i, energies, tag=None):
+
+        return self.flux(energies)
+
+
+def _reference_simpson(flux, e1, e2):
+
+    return (e2 - e1) / 6.0 * (flux(e1) + 4 * flux((e1 + e2) / 2.0) + flux(e2))
+
+
+def test_simpson_integral_with_table_model():
+
+    energies = np.logspace(1, 3, 51)
+
+    low_edge = energies[:-1]
+    high_edge = energies[1:]
+
+    table = _TableModel()
+
+    def unchecked_flux(e):
+
+        return np.interp(np.log(e), table._log_energies, table._fluxes)
+
+    expected = _reference_simpson(unchecked_flux, low_edge, high_edge)
+
+    # contiguous bins of the plugin
+
+    spectrum_generator = SpectrumLike.from_function(
+        "fake",
+        source_function=Powerlaw(),
+        energy_min=low_edge,
+        energy_max=high_edge,
+    )
+
+    _, integral = spectrum_generator._get_diff_flux_and_integral(table)
+
+    np.testing.assert_allclose(integral(), expected)
+
+    # arbitrary bins
+
+    np.testing.assert_allclose(
+        batched_simps(table.flux, low_edge, high_edge), expected
+    )
+
+    np.testing.assert_allclose(
+        batched_simps(table.flux, low_edge[::-1], high_edge[::-1]), expected[::-1]
+    )
+
+    np.testing.assert_allclose(
+        batched_simps(table.flux, low_edge[3], high_edge[3]), expected[3]
+    )
+
+
+def test_ranges_to_channels():
+
+    energies = np.logspace(1, 3, 51)
+
+    spectrum_generator = SpectrumLike.from_function(
+        "fake",
+        source_function=Powerlaw(),
+        energy_min=energies[:-1],
+        energy_max=energies[1:],
+    )
+
+    edges = spectrum_generator._observed_spectrum.edges
+
+    n_bins = len(edges) - 1
+
+    def reference_channel(s):
+
+        # the scalar lookup of the original implementation
+
+        if s[0].lower() == "c":
+
+            return int(s[1:])
+
+        return min(max(0, np.searchsorted(edges, float(s)) - 1), n_bins)
+
+    ranges = ["10-30", "c5-c20", "c3-100", "15.5-c40", "1-2000", "40-950"]
+
+    expected = np.array(
+        [[reference_channel(s) for s in r.split("-")] for r in ranges]
+    )
+
+    np.testing.assert_array_equal(
+        spectrum_generator._ranges_to_channels(ranges), expected
+    )
+
+    # the active mask follows from the same channel ranges
+
+    spectrum_generator.set_active_measurements("10-30", "c30-500")
+
+    expected_mask = np.zeros(n_bins, dtype=bool)
+
+    for r in ["10-30", "c30-500"]:
+
+        first, last = [reference_channel(s) for s in r.split("-")]
+
+        expected_mask[first : last + 1] = True
+
+    np.testing.assert_array_equal(spectrum_generator.mask, expected_mask)
+
+    with pytest.raises(RuntimeError):
+
+        spectrum_generator._ranges_to_channels(["100-10"])
+
+    with pytest.raises(RuntimeError):
+
+        spectrum_generator._ranges_to_channels(["c1-c%d" % (n_bins + 1)])
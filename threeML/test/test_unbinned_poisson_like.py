@@ -6,7 +6,9 @@ from threeML.bayesian.bayesian_analysis import BayesianAnalysis
 from threeML.classicMLE.joint_likelihood import JointLikelihood
 from threeML.data_list import DataList
 from threeML.plugins.UnbinnedPoissonLike import (EventObservation,
-                                                 UnbinnedPoissonLike)
+                                                 UnbinnedPoissonLike,
+                                                 _evaluate_logM_sum, _tiny)
+from threeML.utils.time_series.polynomial import unbinned_polyfit
 
 from .conftest import event_observation_contiguous, event_observation_split
 
@@ -100,3 +102,36 @@ def test_ubinned_poisson_full(event_observation_contiguous, event_observation_sp
     ba.restore_median_fit()
 
     np.testing.assert_allclose([s.a.value, s.b.value], [2., .2], rtol=.5)
+
+
+def test_evaluate_logM_sum():
+
+    M = np.array([1.0, 2.0, 0.0, -1.0])
+
+    # values below the threshold (negative ones treated as zero) are
+    # linearly extrapolated from the log at _tiny
+
+    expected = np.log(2.0) + 2 * (np.log(_tiny) - 1.0)
+
+    np.testing.assert_allclose(_evaluate_logM_sum(M, len(M)), expected)
+
+    # an overflowing model must reject the point, not turn it into a nan
+
+    M = np.array([1.0, np.finfo(float).max, 0.0]) * 2.0
+
+    assert _evaluate_logM_sum(M, len(M)) == np.inf
+
+
+def test_unbinned_polyfit_uniform_rate():
+
+    # 1000 events uniform over 100 s, i.e. a constant rate of 10 counts/s
+
+    rng = np.random.default_rng(1234)
+
+    events = np.sort(rng.uniform(0.0, 100.0, 1000))
+
+    polynomial, _ = unbinned_polyfit(events, 0, 0.0, 100.0, 100.0, bayes=False)
+
+    np.testing.assert_allclose(polynomial.coefficients[0], 10.0, rtol=0.2)
+
+    np.testing.assert_allclose(polynomial.integral(0.0, 100.0), 1000.0, rtol=0.2)
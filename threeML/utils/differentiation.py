@@ -1,3 +1,5 @@
+from typing import Callable, NamedTuple
+
 import numdifftools as nd
 import numpy as np
 from astromodels import SettingOutOfBounds
@@ -11,6 +13,19 @@ class CannotComputeHessian(RuntimeError):
     pass
 
 
+class _ScaledFunction(NamedTuple):
+    """
+    The function to differentiate, expressed in coordinates rescaled by their order of magnitude,
+    together with what is needed to differentiate it and to scale the result back
+    """
+
+    wrapper: Callable
+    scaled_deltas: np.ndarray
+    scaled_point: np.ndarray
+    orders_of_magnitude: np.ndarray
+    n_dim: int
+
+
 def _get_wrapper(function, point, minima, maxima):
 
     point = np.array(point, ndmin=1, dtype=float)
@@ -23,8 +38,7 @@ def _get_wrapper(function, point, minima, maxima):
     # to treat it differently
     idx = point == 0.0
 
-    orders_of_magnitude = np.zeros_like(point)
-    orders_of_magnitude[idx] = 1.0
+    orders_of_magnitude = np.ones_like(point)
     orders_of_magnitude[~idx] = 10 ** np.ceil(
         np.log10(np.abs(point[~idx]))
     )  # type: np.ndarray
@@ -38,62 +52,32 @@ def _get_wrapper(function, point, minima, maxima):
     # of delta, as long as we are not going beyond the boundaries (which would cause
     # the procedure to fail)
 
-    scaled_deltas = np.zeros_like(scaled_point)
-
-    for i in range(n_dim):
-
-        scaled_value = scaled_point[i]
-
-        scaled_min_value, scaled_max_value = (scaled_minima[i], scaled_maxima[i])
-
-        if scaled_value == scaled_min_value or scaled_value == scaled_max_value:
-
-            raise ParameterOnBoundary(
-                "Value for parameter number %s is on the boundary" % i
-            )
-
-        if not np.isnan(scaled_min_value):
-
-            # Parameter with low bound
-
-            distance_to_min = scaled_value - scaled_min_value
-
-        else:
-
-            # No defined minimum
-
-            distance_to_min = np.inf
-
-        if not np.isnan(scaled_max_value):
+    on_boundary = (scaled_point == scaled_minima) | (scaled_point == scaled_maxima)
 
-            # Parameter with hi bound
+    if np.any(on_boundary):
 
-            distance_to_max = scaled_max_value - scaled_value
+        raise ParameterOnBoundary(
+            "Value for parameter number %s is on the boundary" % np.flatnonzero(on_boundary)[0]
+        )
 
-        else:
-
-            # No defined maximum
-
-            distance_to_max = np.inf
-
-        # Delta is the minimum between 0.03% of the value, and 1/2.5 times the minimum
-        # distance to either boundary. 1/2 of that factor is due to the fact that numdifftools uses
-        # twice the delta to compute the differential, and the 0.5 is due to the fact that we don't want
-        # to go exactly equal to the boundary
-
-        if scaled_point[i] == 0.0:
+    # Parameters without a defined minimum or maximum have an infinite distance to it
 
-            scaled_deltas[i] = min([1e-5, distance_to_max / 2.5, distance_to_min / 2.5])
+    distance_to_min = np.where(
+        np.isnan(scaled_minima), np.inf, scaled_point - scaled_minima
+    )
+    distance_to_max = np.where(
+        np.isnan(scaled_maxima), np.inf, scaled_maxima - scaled_point
+    )
 
-        else:
+    # Delta is the minimum between 0.03% of the value, and 1/2.5 times the minimum
+    # distance to either boundary. 1/2 of that factor is due to the fact that numdifftools uses
+    # twice the delta to compute the differential, and the 0.5 is due to the fact that we don't want
+    # to go exactly equal to the boundary
 
-            scaled_deltas[i] = min(
-                [
-                    0.003 * abs(scaled_point[i]),
-                    distance_to_max / 2.5,
-                    distance_to_min / 2.5,
-                ]
-            )
+    scaled_deltas = np.minimum(
+        np.where(idx, 1e-5, 0.003 * np.abs(scaled_point)),
+        np.minimum(distance_to_max, distance_to_min) / 2.5,
+    )
 
     def wrapper(x):
 
@@ -113,19 +97,19 @@ def _get_wrapper(function, point, minima, maxima):
 
             return result
 
-    return wrapper, scaled_deltas, scaled_point, orders_of_magnitude, n_dim
+    return _ScaledFunction(
+        wrapper, scaled_deltas, scaled_point, orders_of_magnitude, n_dim
+    )
 
 
 def get_jacobian(function, point, minima, maxima):
 
-    wrapper, scaled_deltas, scaled_point, orders_of_magnitude, n_dim = _get_wrapper(
-        function, point, minima, maxima
-    )
+    scaled_function = _get_wrapper(function, point, minima, maxima)
 
     # Compute the Jacobian matrix at best_fit_values
-    jacobian_vector = nd.Jacobian(wrapper, scaled_deltas, method="central")(
-        scaled_point
-    )
+    jacobian_vector = nd.Jacobian(
+        scaled_function.wrapper, scaled_function.scaled_deltas, method="central"
+    )(scaled_function.scaled_point)
 
     # Transform it to numpy matrix
 
@@ -133,30 +117,34 @@ def get_jacobian(function, point, minima, maxima):
 
     # Now correct back the Jacobian for the scales
 
-    jacobian_vector /= orders_of_magnitude
+    jacobian_vector /= scaled_function.orders_of_magnitude
 
     return jacobian_vector[0]
 
 
 def get_hessian(function, point, minima, maxima):
 
-    wrapper, scaled_deltas, scaled_point, orders_of_magnitude, n_dim = _get_wrapper(
-        function, point, minima, maxima
-    )
+    scaled_function = _get_wrapper(function, point, minima, maxima)
 
     # Compute the Hessian matrix at best_fit_values
 
-    hessian_matrix_ = nd.Hessian(wrapper, scaled_deltas)(scaled_point)
+    hessian_matrix_ = nd.Hessian(
+        scaled_function.wrapper, scaled_function.scaled_deltas
+    )(scaled_function.scaled_point)
 
     # Transform it to numpy matrix
 
     hessian_matrix = np.array(hessian_matrix_)
 
-    # Now correct back the Hessian for the scales
-    for i in range(n_dim):
+    # The Hessian is symmetric by construction, so average out the numerical noise
+    # between the two triangles
+
+    hessian_matrix = 0.5 * (hessian_matrix + hessian_matrix.T)
 
-        for j in range(n_dim):
+    # Now correct back the Hessian for the scales
 
-            hessian_matrix[i, j] /= orders_of_magnitude[i] * orders_of_magnitude[j]
+    hessian_matrix /= np.outer(
+        scaled_function.orders_of_magnitude, scaled_function.orders_of_magnitude
+    )
 
     return hessian_matrix
@@ -0,0 +1,44 @@
+import numpy as np
+
+
+def interleave(e_edges, e_m):
+    """
+    merge contiguous bin edges and their mid points in a single
+    increasing energy grid (edges at the even, mid points at the odd indices)
+
+    :param e_edges: the bin edges
+    :param e_m: the mid points of the bins
+    :returns: the merged grid
+    """
+
+    energies = np.empty(e_edges.shape[0] + e_m.shape[0])
+
+    energies[0::2] = e_edges
+    energies[1::2] = e_m
+
+    return energies
+
+
+def batched_simps(differential_flux, e1, e2):
+    """
+    Simpson's rule between e1 and e2 (values or arrays of the same shape),
+    evaluating the model at the lower ends, the mid points and the upper
+    ends in a single call. The model is evaluated on the sorted unique
+    energies, as some models (e.g. tables) expect an ordered grid
+
+    :param differential_flux: the model
+    :param e1: lower ends
+    :param e2: upper ends
+    :returns: the integrals
+    """
+
+    shape = np.shape(e1)
+
+    energies, index = np.unique(
+        np.concatenate((np.ravel(e1), np.ravel((e1 + e2) / 2.0), np.ravel(e2))),
+        return_inverse=True,
+    )
+
+    fluxes = differential_flux(energies)[index].reshape((3,) + shape)
+
+    return (e2 - e1) / 6.0 * (fluxes[0] + 4 * fluxes[1] + fluxes[2])
@@ -436,13 +436,13 @@ class IntervalSet(object):
     def containing_bin(self, value):
         """
         finds the index of the interval containing
-        :param value:
+        :param value: a value or an array of values
         :return:
         """
 
         # Get the index of the first ebounds upper bound larger than energy
         # (but never go below zero or above the last channel)
-        idx = min(max(0, np.searchsorted(self.edges, value) - 1), len(self))
+        idx = np.clip(np.searchsorted(self.edges, value) - 1, 0, len(self))
 
         return idx
 
@@ -1,3 +1,5 @@
+import math
+
 import numba as nb
 import numpy as np
 
@@ -172,3 +174,20 @@ def _isinstance(obj):
 @nb.njit(fastmath=True)
 def nb_sum(x):
     return np.sum(x)
+
+
+@nb.njit("float64(float64[:])", cache=True)
+def nb_sum_log(x):
+    """
+    sum of the natural log of x. returns -inf as soon as
+    a non-positive value is found
+
+    compiled eagerly with an explicit signature and cached on disk,
+    so that short analyses do not pay for the type inference
+    """
+    s = 0.0
+    for v in x:
+        if v <= 0.0:
+            return -np.inf
+        s += math.log(v)
+    return s
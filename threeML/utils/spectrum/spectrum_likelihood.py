@@ -8,8 +8,9 @@ import numpy as np
 from threeML.io.logging import setup_logger
 from threeML.utils.numba_utils import nb_sum
 from threeML.utils.statistics.likelihood_functions import (
-    half_chi2, poisson_log_likelihood_ideal_bkg,
-    poisson_observed_gaussian_background, poisson_observed_poisson_background)
+    half_chi2, log_factorials, poisson_log_likelihood_ideal_bkg_precalc,
+    poisson_observed_gaussian_background_precalc,
+    poisson_observed_poisson_background_precalc)
 
 log = setup_logger(__name__)
 
@@ -29,6 +30,28 @@ class BinnedStatistic(object):
 
         self._spectrum_plugin = spectrum_plugin
 
+        self._log_factorial_cache = {}
+
+    def _get_log_factorials(self, name, counts):
+        """
+        the log factorials of a counts vector of the plugin. They are only
+        recomputed when the plugin hands over a new array, i.e. after the
+        mask or the rebinning changed
+
+        :param name: the name of the counts vector
+        :param counts: the counts vector
+        :return: vector of log(counts!)
+        """
+
+        cached_counts, values = self._log_factorial_cache.get(name, (None, None))
+
+        if cached_counts is not counts:
+
+            values = log_factorials(counts)
+
+            self._log_factorial_cache[name] = (counts, values)
+
+        return values
 
     def get_current_value(self):
         RuntimeError("must be implemented in subclass")
@@ -110,10 +133,13 @@ class PoissonObservedIdealBackgroundStatistic(BinnedStatistic):
 
         model_counts = self._spectrum_plugin.get_model(precalc_fluxes=precalc_fluxes)
 
-        loglike, _ = poisson_log_likelihood_ideal_bkg(
-            self._spectrum_plugin.current_observed_counts,
+        observed_counts = self._spectrum_plugin.current_observed_counts
+
+        loglike, _ = poisson_log_likelihood_ideal_bkg_precalc(
+            observed_counts,
             self._spectrum_plugin.current_scaled_background_counts,
             model_counts,
+            self._get_log_factorials("observed", observed_counts),
         )
 
         return nb_sum(loglike), None
@@ -161,10 +187,13 @@ class PoissonObservedModeledBackgroundStatistic(BinnedStatistic):
             * self._spectrum_plugin.scale_factor
         )
 
-        loglike, _ = poisson_log_likelihood_ideal_bkg(
-            self._spectrum_plugin.current_observed_counts,
+        observed_counts = self._spectrum_plugin.current_observed_counts
+
+        loglike, _ = poisson_log_likelihood_ideal_bkg_precalc(
+            observed_counts,
             background_model_counts,
             model_counts,
+            self._get_log_factorials("observed", observed_counts),
         )
 
         bkg_log_like = self._spectrum_plugin.background_plugin.get_log_like()
@@ -219,10 +248,13 @@ class PoissonObservedNoBackgroundStatistic(BinnedStatistic):
 
         background_model_counts = np.zeros_like(model_counts)
 
-        loglike, _ = poisson_log_likelihood_ideal_bkg(
-            self._spectrum_plugin.current_observed_counts,
+        observed_counts = self._spectrum_plugin.current_observed_counts
+
+        loglike, _ = poisson_log_likelihood_ideal_bkg_precalc(
+            observed_counts,
             background_model_counts,
             model_counts,
+            self._get_log_factorials("observed", observed_counts),
         )
 
         return nb_sum(loglike), None
@@ -248,11 +280,17 @@ class PoissonObservedPoissonBackgroundStatistic(BinnedStatistic):
         # Scale factor between source and background spectrum
         model_counts = self._spectrum_plugin.get_model(precalc_fluxes=precalc_fluxes)
 
-        loglike, bkg_model = poisson_observed_poisson_background(
-            self._spectrum_plugin.current_observed_counts,
-            self._spectrum_plugin.current_background_counts,
+        observed_counts = self._spectrum_plugin.current_observed_counts
+
+        background_counts = self._spectrum_plugin.current_background_counts
+
+        loglike, bkg_model = poisson_observed_poisson_background_precalc(
+            observed_counts,
+            background_counts,
             self._spectrum_plugin.scale_factor,
             model_counts,
+            self._get_log_factorials("observed", observed_counts),
+            self._get_log_factorials("background", background_counts),
         )
 
         return nb_sum(loglike), bkg_model
@@ -298,11 +336,14 @@ class PoissonObservedGaussianBackgroundStatistic(BinnedStatistic):
     def get_current_value(self, precalc_fluxes: Optional[np.array]=None):
         expected_model_counts = self._spectrum_plugin.get_model(precalc_fluxes=precalc_fluxes)
 
-        loglike, bkg_model = poisson_observed_gaussian_background(
-            self._spectrum_plugin.current_observed_counts,
+        observed_counts = self._spectrum_plugin.current_observed_counts
+
+        loglike, bkg_model = poisson_observed_gaussian_background_precalc(
+            observed_counts,
             self._spectrum_plugin.current_background_counts,
             self._spectrum_plugin.current_background_count_errors,
             expected_model_counts,
+            self._get_log_factorials("observed", observed_counts),
         )
 
         return nb_sum(loglike), bkg_model
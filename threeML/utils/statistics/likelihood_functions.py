@@ -59,6 +59,26 @@ def xlogy_one(x, y):
         return 0.0
 
 
+@njit(fastmath=True)
+def log_factorials(counts):
+    """
+    The logarithm of the factorial of each element of counts. The observed counts do not change during a fit,
+    so this can be computed once and passed to the *_precalc likelihoods.
+
+    :param counts:
+    :return: vector of log(counts!)
+    """
+
+    n = counts.shape[0]
+    out = np.empty(n, dtype=np.float64)
+
+    for i in range(n):
+
+        out[i] = logfactorial(counts[i])
+
+    return out
+
+
 @njit(fastmath=True)
 def poisson_log_likelihood_ideal_bkg(
     observed_counts, expected_bkg_counts, expected_model_counts
@@ -74,20 +94,43 @@ def poisson_log_likelihood_ideal_bkg(
     :return: (log_like vector, background vector)
     """
 
+    return poisson_log_likelihood_ideal_bkg_precalc(
+        observed_counts,
+        expected_bkg_counts,
+        expected_model_counts,
+        log_factorials(observed_counts),
+    )
+
+
+@njit(fastmath=True)
+def poisson_log_likelihood_ideal_bkg_precalc(
+    observed_counts, expected_bkg_counts, expected_model_counts, log_factorial_observed
+):
+    """
+    Same as poisson_log_likelihood_ideal_bkg, with log(o_i!) already computed
+
+    :param observed_counts:
+    :param expected_bkg_counts:
+    :param expected_model_counts:
+    :param log_factorial_observed: log factorials of the observed counts
+    :return: (log_like vector, background vector)
+    """
+
     # Model predicted counts
     # In this likelihood the background becomes part of the model, which means that
     # the uncertainty in the background is completely neglected
 
     n = expected_model_counts.shape[0]
     log_likes = np.empty(n, dtype=np.float64)
-    predicted_counts = expected_bkg_counts + expected_model_counts
 
     for i in range(n):
 
+        predicted_counts = expected_bkg_counts[i] + expected_model_counts[i]
+
         log_likes[i] = (
-            xlogy_one(observed_counts[i], predicted_counts[i])
-            - predicted_counts[i]
-            - logfactorial(observed_counts[i])
+            xlogy_one(observed_counts[i], predicted_counts)
+            - predicted_counts
+            - log_factorial_observed[i]
         )
 
     return log_likes, expected_bkg_counts
@@ -159,6 +202,26 @@ def poisson_observed_poisson_background(
     observed_counts, background_counts, exposure_ratio, expected_model_counts
 ):
 
+    return poisson_observed_poisson_background_precalc(
+        observed_counts,
+        background_counts,
+        exposure_ratio,
+        expected_model_counts,
+        log_factorials(observed_counts),
+        log_factorials(background_counts),
+    )
+
+
+@njit(fastmath=True)
+def poisson_observed_poisson_background_precalc(
+    observed_counts,
+    background_counts,
+    exposure_ratio,
+    expected_model_counts,
+    log_factorial_observed,
+    log_factorial_background,
+):
+
     # TODO: check this with simulations
 
     # Just a name change to make writing formulas a little easier
@@ -205,8 +268,8 @@ def poisson_observed_poisson_background(
             + xlogy_one(background_counts[idx], B_mle[idx])
             - (alpha + 1) * B_mle[idx]
             - expected_model_counts[idx]
-            - logfactorial(background_counts[idx])
-            - logfactorial(observed_counts[idx])
+            - log_factorial_background[idx]
+            - log_factorial_observed[idx]
         )
 
     return loglike, B_mle * alpha
@@ -217,6 +280,24 @@ def poisson_observed_gaussian_background(
     observed_counts, background_counts, background_error, expected_model_counts
 ):
 
+    return poisson_observed_gaussian_background_precalc(
+        observed_counts,
+        background_counts,
+        background_error,
+        expected_model_counts,
+        log_factorials(observed_counts),
+    )
+
+
+@njit(fastmath=True)
+def poisson_observed_gaussian_background_precalc(
+    observed_counts,
+    background_counts,
+    background_error,
+    expected_model_counts,
+    log_factorial_observed,
+):
+
     # This loglike assume Gaussian errors on the background and Poisson uncertainties on the
 
     # observed counts. It is a profile likelihood.
@@ -253,7 +334,7 @@ def poisson_observed_gaussian_background(
                 log(b[idx] + expected_model_counts[idx])
                 - b[idx]
                 - expected_model_counts[idx]
-                - logfactorial(observed_counts[idx])
+                - log_factorial_observed[idx]
                 - 0.5 * _log_pi_2
                 - log(background_error[idx])
             )
@@ -267,7 +348,7 @@ def poisson_observed_gaussian_background(
             log_likes[idx] = (
                 xlogy_one(observed_counts[idx], expected_model_counts[idx])
                 - expected_model_counts[idx]
-                - logfactorial(observed_counts[idx])
+                - log_factorial_observed[idx]
             )
 
     return log_likes, b
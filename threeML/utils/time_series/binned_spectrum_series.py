@@ -170,15 +170,18 @@ class BinnedSpectrumSeries(TimeSeries):
 
         if self.poly_fit_exists:
 
-            bkg = []
-            for j, time_bin in enumerate(bins):
-                tmpbkg = 0.0
-                for poly in self.polynomials[use_echans_start:use_echans_stop+1]:
+            # integrate each polynomial over all the time bins at once
 
-                    tmpbkg += poly.integral(time_bin.start_time, time_bin.stop_time)
-                    
-                
-                bkg.append(tmpbkg/width[j])
+            bin_starts = np.asarray(bins.start_times)
+            bin_stops = np.asarray(bins.stop_times)
+
+            tmpbkg = 0.0
+
+            for poly in self.polynomials[use_echans_start:use_echans_stop+1]:
+
+                tmpbkg = tmpbkg + poly.integral(bin_starts, bin_stops)
+
+            bkg = list(tmpbkg / np.array(width))
                 
             
             
@@ -493,37 +496,16 @@ class BinnedSpectrumSeries(TimeSeries):
 
         self._time_intervals = time_intervals
 
-        tmp_counts = []
-        tmp_err = []  # Temporary list to hold the err counts per chan
-
         if self._poly_fit_exists:
 
             if not self._poly_fit_exists:
                 raise RuntimeError(
                     "A polynomial fit to the channels does not exist!")
 
-            for chan in range(self._n_channels):
-
-                total_counts = 0
-                counts_err = 0
-
-                for tmin, tmax in zip(
-                    self._time_intervals.start_times, self._time_intervals.stop_times
-                ):
-                    # Now integrate the appropriate background polynomial
-                    total_counts += self._polynomials[chan].integral(
-                        tmin, tmax)
-                    counts_err += (
-                        self._polynomials[chan].integral_error(tmin, tmax)
-                    ) ** 2
-
-                tmp_counts.append(total_counts)
-
-                tmp_err.append(np.sqrt(counts_err))
-
-            self._poly_counts = np.array(tmp_counts)
-
-            self._poly_count_err = np.array(tmp_err)
+            # Now integrate the background polynomials of all channels
+            self._poly_counts, self._poly_count_err = self._polynomial_counts_and_errors(
+                self._time_intervals
+            )
 
         self._exposure = self._binned_spectrum_set.exposure_per_bin[all_idx].sum(
         )
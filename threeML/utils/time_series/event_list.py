@@ -25,11 +25,24 @@ from threeML.io.rich_display import display
 from threeML.parallel.parallel_client import ParallelClient
 from threeML.utils.binner import TemporalBinner
 from threeML.utils.time_interval import TimeIntervalSet
-from threeML.utils.time_series.polynomial import polyfit, unbinned_polyfit
+from threeML.utils.time_series.polynomial import (Polynomial, polyfit,
+                                                  unbinned_polyfit)
 from threeML.utils.time_series.time_series import TimeSeries
 
 log = setup_logger(__name__)
 
+try:
+
+    from fast_histogram import histogram1d, histogram2d
+
+except ImportError:
+
+    has_fast_histogram = False
+
+else:
+
+    has_fast_histogram = True
+
 
 class ReducingNumberOfThreads(Warning):
     pass
@@ -107,6 +120,11 @@ class EventList(TimeSeries):
         self._arrival_times = np.asarray(arrival_times)
         self._measurement = np.asarray(measurement)
 
+        # with time ordered events, selections can be found by bisection
+        self._arrival_times_sorted = bool(
+            np.all(self._arrival_times[1:] >= self._arrival_times[:-1])
+        )
+
         self._temporal_binner = None
 
         assert (
@@ -158,11 +176,7 @@ class EventList(TimeSeries):
             # create phas to check
             phas = np.arange(self._first_channel, self._n_channels)[mask]
 
-            this_mask = np.zeros_like(self._arrival_times, dtype=bool)
-
-            for channel in phas:
-                this_mask = np.logical_or(
-                    this_mask, self._measurement == channel)
+            this_mask = np.isin(self._measurement, phas)
 
             events = self._arrival_times[this_mask]
 
@@ -330,48 +344,41 @@ class EventList(TimeSeries):
                                        bins=(bins, echan_bins))
         cnts = np.sum(cnts, axis=1)
 
-        time_bins = np.array([[bins[i], bins[i + 1]]
-                              for i in range(len(bins) - 1)])
-
-        # now we want to get the estimated background from the polynomial fit
+        # build the bin bounds once from the edges
 
-        if self.poly_fit_exists:
+        bin_starts = bins[:-1]
+        bin_stops = bins[1:]
 
-            # we will store the bkg rate for each time bin
+        time_bins = np.column_stack((bin_starts, bin_stops))
 
-            bkg = []
+        # now we want to get the estimated background from the polynomial fit
 
-            for j, tb in enumerate(time_bins):
+        if self.poly_fit_exists:
 
-                # zero out the bkg
-                tmpbkg = 0.0
+            # sum up the counts of each polynomial over all the time bins at once
 
-                # sum up the counts over this interval
+            tmpbkg = 0.0
 
-                for poly in self.polynomials[use_echans_start:use_echans_stop+1]:
+            for poly in self.polynomials[use_echans_start:use_echans_stop+1]:
 
-                    tmpbkg += poly.integral(tb[0], tb[1])
+                tmpbkg = tmpbkg + poly.integral(bin_starts, bin_stops)
 
-                # capture the bkg *rate*
+            # capture the bkg *rate*
 
-                # Divide the background counts by the time intervall
-                # We do not use the dead time corrected exposure here
-                # because the integration is done over the full time bin
-                # and not the dead time corrected exposure
-                bkg.append(old_div(tmpbkg, tb[1]-tb[0]))
+            # Divide the background counts by the time intervall
+            # We do not use the dead time corrected exposure here
+            # because the integration is done over the full time bin
+            # and not the dead time corrected exposure
+            bkg = list(tmpbkg / (bin_stops - bin_starts))
 
         else:
 
             bkg = None
 
-        width = []
-        for j, tb in enumerate(time_bins):
-            # capture the exposure
-            this_width = self.exposure_over_interval(tb[0], tb[1])
-
-            width.append(this_width)
-
-        width = np.array(width)
+        # capture the exposure
+        width = np.array(
+            [self.exposure_over_interval(a, b) for a, b in zip(bin_starts, bin_stops)]
+        )
 
         # pass all this to the light curve plotter
 
@@ -411,24 +418,28 @@ class EventList(TimeSeries):
         # this will be a boolean list and the sum will be the
         # number of events
 
-        return self._select_events(start, stop).sum()
+        return len(self._arrival_times[self._event_index(start, stop)])
 
     def count_per_channel_over_interval(self, start, stop):
 
-        channels = list(
-            range(self._first_channel, self._n_channels + self._first_channel)
-        )
+        selection = self._event_index(start, stop)
 
-        counts_per_channel = np.zeros(len(channels))
+        return self._count_per_channel(self._measurement[selection]).astype(float)
 
-        selection = self._select_events(start, stop)
+    def _count_per_channel(self, measurement):
+        """
+        count the events of each channel in a single pass
+
+        :param measurement: the channels of the selected events
+        :return: array of counts per channel
+        """
 
-        for i, channel in enumerate(channels):
-            channel_mask = self._measurement[selection] == channel
+        channel_idx = measurement.astype(np.intp) - self._first_channel
 
-            counts_per_channel[i] += channel_mask.sum()
+        channel_idx = channel_idx[
+            (channel_idx >= 0) & (channel_idx < self._n_channels)]
 
-        return counts_per_channel
+        return np.bincount(channel_idx, minlength=self._n_channels)
 
     def _select_events(self, start, stop):
         """
@@ -438,8 +449,35 @@ class EventList(TimeSeries):
         :return:
         """
 
+        if self._arrival_times_sorted:
+
+            mask = np.zeros(self._arrival_times.shape[0], dtype=bool)
+
+            mask[self._event_index(start, stop)] = True
+
+            return mask
+
         return np.logical_and(start <= self._arrival_times, self._arrival_times <= stop)
 
+    def _event_index(self, start, stop):
+        """
+        return something that indexes the selected events: a slice if the
+        arrival times are sorted, so no pass over all events is needed,
+        and a boolean mask otherwise
+        :param start: start time
+        :param stop: stop time
+        :return: slice or boolean mask
+        """
+
+        if self._arrival_times_sorted:
+
+            first = np.searchsorted(self._arrival_times, start, side="left")
+            last = np.searchsorted(self._arrival_times, stop, side="right")
+
+            return slice(first, last)
+
+        return self._select_events(start, stop)
+
     def _fit_polynomials(self, bayes=False):
         """
 
@@ -460,17 +498,10 @@ class EventList(TimeSeries):
 
         for selection in self._bkg_intervals:
             all_bkg_masks.append(
-                np.logical_and(
-                    self._arrival_times >= selection.start_time,
-                    self._arrival_times <= selection.stop_time,
-                )
+                self._select_events(selection.start_time, selection.stop_time)
             )
-        poly_mask = all_bkg_masks[0]
-
-        # If there are multiple masks:
-        if len(all_bkg_masks) > 1:
-            for mask in all_bkg_masks[1:]:
-                poly_mask = np.logical_or(poly_mask, mask)
+        # combine the masks of all the selections in a single pass
+        poly_mask = np.logical_or.reduce(all_bkg_masks)
 
         # Select the all the events in the poly selections
         # We only need to do this once
@@ -489,21 +520,69 @@ class EventList(TimeSeries):
         bin_width = 1.0  # seconds
         these_bins = np.arange(self._start_time, self._stop_time, bin_width)
 
-        cnts, bins = np.histogram(total_poly_events, bins=these_bins)
+        n_bins = len(these_bins) - 1
 
-        # Find the mean time of the bins and calculate the exposure in each bin
-        mean_time = []
-        exposure_per_bin = []
-        for i in range(len(bins) - 1):
-            m = np.mean((bins[i], bins[i + 1]))
-            mean_time.append(m)
+        bins = these_bins
+
+        # bin all channels at once in a (channel, time bin) count matrix
+        # so that the channel loops below only have to pick out a row
+
+        if has_fast_histogram:
+
+            # the bins are regular, so fast_histogram can find the bin of
+            # each event arithmetically instead of searching the edges
+
+            time_range = (these_bins[0], these_bins[-1])
+
+            # fast_histogram counts in floats, cast back to integer counts so
+            # that both branches give the same result
+
+            cnts = histogram1d(
+                total_poly_events, bins=n_bins, range=time_range
+            ).astype(np.int64)
+
+            counts_per_channel = histogram2d(
+                total_poly_energies,
+                total_poly_events,
+                bins=(self._n_channels, n_bins),
+                range=(
+                    (self._first_channel - 0.5,
+                     self._first_channel + self._n_channels - 0.5),
+                    time_range,
+                ),
+            ).astype(np.int64)
+
+        else:
 
-            exposure_per_bin.append(
-                self.exposure_over_interval(bins[i], bins[i + 1]))
+            # assign every event to its time bin once, using the same edge
+            # convention as np.histogram (half open bins, the last one closed)
 
-        mean_time = np.array(mean_time)
+            time_idx = np.searchsorted(
+                these_bins, total_poly_events, side="right") - 1
 
-        exposure_per_bin = np.array(exposure_per_bin)
+            time_idx[total_poly_events == these_bins[-1]] = n_bins - 1
+
+            in_time = (time_idx >= 0) & (time_idx < n_bins)
+
+            cnts = np.bincount(time_idx[in_time], minlength=n_bins)
+
+            channel_idx = total_poly_energies.astype(
+                np.intp) - self._first_channel
+
+            in_channel = in_time & (channel_idx >= 0) & (
+                channel_idx < self._n_channels)
+
+            counts_per_channel = np.bincount(
+                channel_idx[in_channel] * n_bins + time_idx[in_channel],
+                minlength=self._n_channels * n_bins,
+            ).reshape(self._n_channels, n_bins)
+
+        # Find the mean time of the bins and calculate the exposure in each bin
+        mean_time = 0.5 * (bins[:-1] + bins[1:])
+
+        exposure_per_bin = np.array(
+            [self.exposure_over_interval(a, b) for a, b in zip(bins[:-1], bins[1:])]
+        )
 
         # Remove bins with zero counts
         all_non_zero_mask = []
@@ -515,10 +594,7 @@ class EventList(TimeSeries):
                 )
             )
 
-        non_zero_mask = all_non_zero_mask[0]
-        if len(all_non_zero_mask) > 1:
-            for mask in all_non_zero_mask[1:]:
-                non_zero_mask = np.logical_or(mask, non_zero_mask)
+        non_zero_mask = np.logical_or.reduce(all_non_zero_mask)
 
         # Now we will find the the best poly order unless the use specified one
         # The total cnts (over channels) is binned to .1 sec intervals
@@ -551,15 +627,14 @@ class EventList(TimeSeries):
 
             def worker(channel):
 
-                channel_mask = total_poly_energies == channel
+                cnts = counts_per_channel[channel - self._first_channel]
 
-                # Mask background events and current channel
-                # poly_chan_mask = np.logical_and(poly_mask, channel_mask)
-                # Select the masked events
+                # channels without background counts get a zero polynomial
+                # without building a fit for them
 
-                current_events = total_poly_events[channel_mask]
+                if not cnts[non_zero_mask].any():
 
-                cnts, bins = np.histogram(current_events, bins=these_bins)
+                    return Polynomial([0.0] * (self._optimal_polynomial_grade + 1))
 
                 polynomial, _ = polyfit(
                     mean_time[non_zero_mask],
@@ -586,17 +661,19 @@ class EventList(TimeSeries):
 
             for channel in tqdm(channels, desc=f"Fitting {self._instrument} background"):
 
-                channel_mask = total_poly_energies == channel
+                # the selected channel counts were binned above
+
+                cnts = counts_per_channel[channel - self._first_channel]
 
-                # Mask background events and current channel
-                # poly_chan_mask = np.logical_and(poly_mask, channel_mask)
-                # Select the masked events
+                # channels without background counts get a zero polynomial
+                # without building a fit for them
 
-                current_events = total_poly_events[channel_mask]
+                if not cnts[non_zero_mask].any():
 
-                # now bin the selected channel counts
+                    polynomials.append(
+                        Polynomial([0.0] * (self._optimal_polynomial_grade + 1)))
 
-                cnts, bins = np.histogram(current_events, bins=these_bins)
+                    continue
 
                 # Put data to fit in an x vector and y vector
 
@@ -635,17 +712,10 @@ class EventList(TimeSeries):
             )
 
             all_bkg_masks.append(
-                np.logical_and(
-                    self._arrival_times >= selection.start_time,
-                    self._arrival_times <= selection.stop_time,
-                )
+                self._select_events(selection.start_time, selection.stop_time)
             )
-        poly_mask = all_bkg_masks[0]
-
-        # If there are multiple masks:
-        if len(all_bkg_masks) > 1:
-            for mask in all_bkg_masks[1:]:
-                poly_mask = np.logical_or(poly_mask, mask)
+        # combine the masks of all the selections in a single pass
+        poly_mask = np.logical_or.reduce(all_bkg_masks)
 
         # Select the all the events in the poly selections
         # We only need to do this once
@@ -681,6 +751,19 @@ class EventList(TimeSeries):
             range(self._first_channel, self._n_channels + self._first_channel)
         )
 
+        # sort the background events by channel once, so that the events
+        # of each channel are a contiguous slice instead of a masked copy
+
+        channel_order = np.argsort(total_poly_energies, kind="stable")
+
+        events_by_channel = total_poly_events[channel_order]
+
+        channel_bounds = np.searchsorted(
+            total_poly_energies[channel_order],
+            np.arange(self._first_channel,
+                      self._first_channel + self._n_channels + 1),
+        )
+
         # Check whether we are parallelizing or not
 
         t_start = self._bkg_intervals.start_times
@@ -689,13 +772,12 @@ class EventList(TimeSeries):
         if threeML_config["parallel"]["use_parallel"]:
 
             def worker(channel):
-                channel_mask = total_poly_energies == channel
 
-                # Mask background events and current channel
-                # poly_chan_mask = np.logical_and(poly_mask, channel_mask)
-                # Select the masked events
+                idx = channel - self._first_channel
 
-                current_events = total_poly_events[channel_mask]
+                current_events = events_by_channel[
+                    channel_bounds[idx]: channel_bounds[idx + 1]
+                ]
 
                 polynomial, _ = unbinned_polyfit(
                     current_events,
@@ -719,13 +801,12 @@ class EventList(TimeSeries):
             polynomials = []
 
             for channel in tqdm(channels, desc=f"Fitting {self._instrument} background"):
-                channel_mask = total_poly_energies == channel
 
-                # Mask background events and current channel
-                # poly_chan_mask = np.logical_and(poly_mask, channel_mask)
-                # Select the masked events
+                idx = channel - self._first_channel
 
-                current_events = total_poly_events[channel_mask]
+                current_events = events_by_channel[
+                    channel_bounds[idx]: channel_bounds[idx + 1]
+                ]
 
                 polynomial, _ = unbinned_polyfit(
                     current_events,
@@ -769,10 +850,7 @@ class EventList(TimeSeries):
 
         self._time_intervals = time_intervals
 
-        time_mask = interval_masks[0]
-        if len(interval_masks) > 1:
-            for mask in interval_masks[1:]:
-                time_mask = np.logical_or(time_mask, mask)
+        time_mask = np.logical_or.reduce(interval_masks)
 
         # calulate exposure and deadtime
         exposure = 0
@@ -793,20 +871,9 @@ class EventList(TimeSeries):
         self._exposure = exposure
         self._active_dead_time = dead_time
 
-        tmp_counts = []  # Temporary list to hold the total counts per chan
-
-        for chan in range(self._first_channel, self._n_channels + self._first_channel):
-
-            channel_mask = self._measurement == chan
-            counts_mask = np.logical_and(channel_mask, time_mask)
-            total_counts = len(self._arrival_times[counts_mask])
+        # total counts per chan
 
-            tmp_counts.append(total_counts)
-
-        self._counts = np.array(tmp_counts)
-
-        tmp_counts = []
-        tmp_err = []  # Temporary list to hold the err counts per chan
+        self._counts = self._count_per_channel(self._measurement[time_mask])
 
         if self._poly_fit_exists:
 
@@ -814,28 +881,10 @@ class EventList(TimeSeries):
                 raise RuntimeError(
                     "A polynomial fit to the channels does not exist!")
 
-            for chan in range(self._n_channels):
-
-                total_counts = 0
-                counts_err = 0
-
-                for tmin, tmax in zip(
-                    self._time_intervals.start_times, self._time_intervals.stop_times
-                ):
-                    # Now integrate the appropriate background polynomial
-                    total_counts += self._polynomials[chan].integral(
-                        tmin, tmax)
-                    counts_err += (
-                        self._polynomials[chan].integral_error(tmin, tmax)
-                    ) ** 2
-
-                tmp_counts.append(total_counts)
-
-                tmp_err.append(np.sqrt(counts_err))
-
-            self._poly_counts = np.array(tmp_counts)
-
-            self._poly_count_err = np.array(tmp_err)
+            # Now integrate the background polynomials of all channels
+            self._poly_counts, self._poly_count_err = self._polynomial_counts_and_errors(
+                self._time_intervals
+            )
 
             # apply the dead time correction to the background counts
             # and errors
@@ -927,7 +976,7 @@ class EventListWithDeadTime(EventList):
         :return:
         """
 
-        mask = self._select_events(start, stop)
+        mask = self._event_index(start, stop)
 
         if self._dead_time is not None:
 
@@ -1022,7 +1071,7 @@ class EventListWithDeadTimeFraction(EventList):
         :return:
         """
 
-        mask = self._select_events(start, stop)
+        mask = self._event_index(start, stop)
 
         interval = stop - start
 
@@ -2,6 +2,7 @@
 from typing import Iterable, List, Optional, Tuple, Union
 
 import numpy as np
+from numpy.polynomial.polynomial import polyval
 from astromodels import (Constant, Cubic, Gaussian, Line, Log_normal, Model,
                          PointSource, Quadratic)
 
@@ -43,6 +44,8 @@ class Polynomial(object):
         self._i_plus_1: np.ndarray = np.array(
             list(range(1, self._degree + 1 + 1)), dtype=float)
 
+        self._inverse_i_plus_1: np.ndarray = 1.0 / self._i_plus_1
+
         self._cov_matrix: np.ndarray = np.zeros(
             (self._degree + 1, self._degree + 1))
 
@@ -134,10 +137,8 @@ class Polynomial(object):
 
     def __call__(self, x):
 
-        result = 0
-        for coefficient in self._coefficients[::-1]:
-            result = result * x + coefficient
-        return result
+        # horner's scheme over all of x at once in numpy
+        return polyval(x, self._coefficients)
 
     def set_covariace_matrix(self, matrix) -> None:
 
@@ -157,7 +158,25 @@ class Polynomial(object):
 
     def _eval_basis(self, x):
 
-        return (1.0 / self._i_plus_1) * np.power(x, self._i_plus_1)
+        # build the powers x, x**2, ... by repeated multiplication
+        # instead of calling pow for each of them
+
+        powers = np.cumprod(np.full(self._degree + 1, x, dtype=float))
+
+        return self._inverse_i_plus_1 * powers
+
+    def integral_basis(self, xmin, xmax) -> np.ndarray:
+        """
+        the integrals of the monomials over an interval. The integral
+        of the polynomial is the dot product of these with the coefficients,
+        so they can be reused for all polynomials of the same degree
+
+        :param xmin: start of the interval
+        :param xmax: stop of the interval
+        :return: array of the monomial integrals
+        """
+
+        return self._eval_basis(xmax) - self._eval_basis(xmin)
 
     def integral_error(self, xmin, xmax) -> float:
         """
@@ -166,7 +185,7 @@ class Polynomial(object):
         :param xmax: stop of the interval
         :return: interval error
         """
-        c = self._eval_basis(xmax) - self._eval_basis(xmin)
+        c = self.integral_basis(xmin, xmax)
         tmp = c.dot(self._cov_matrix)
         err2 = tmp.dot(c)
 
@@ -235,6 +254,17 @@ def polyfit(x: Iterable[float], y: Iterable[float], grade: int,
 
         if not bayes:
 
+            # the weighted linear least squares solution for the counts
+            # is already close to the poisson MLE, so start minuit from
+            # there instead of from a flat polynomial
+
+            start = _least_squares_start(
+                x, y, exposure, 1 if grade == 0 else len(model.free_parameters))
+
+            if start[0] <= 0:
+
+                start[0] = avg
+
             # make sure the model is positive
 
             for i, (k, v) in enumerate(model.free_parameters.items()):
@@ -243,7 +273,11 @@ def polyfit(x: Iterable[float], y: Iterable[float], grade: int,
 
                     v.bounds = (0, None)
 
-                    v.value = avg
+                    v.value = start[0]
+
+                elif i < len(start):
+
+                    v.value = start[i]
 
                 else:
 
@@ -352,6 +386,31 @@ def polyfit(x: Iterable[float], y: Iterable[float], grade: int,
     return final_polynomial, -min_log_likelihood
 
 
+def _least_squares_start(x: np.ndarray, y: np.ndarray, exposure: np.ndarray,
+                         n_coefficients: int) -> np.ndarray:
+    """
+    solve the linear least squares problem for the polynomial
+    coefficients of binned counts, weighting each bin with its
+    poisson variance
+
+    :param x: the x coord of the data
+    :param y: the counts
+    :param exposure: the exposure of each bin
+    :param n_coefficients: the number of coefficients to solve for
+    :returns: the coefficients in increasing order
+    """
+
+    design = exposure[:, np.newaxis] * np.vander(
+        x, n_coefficients, increasing=True)
+
+    weight = 1.0 / np.sqrt(np.maximum(y, 1.0))
+
+    coefficients, _, _, _ = np.linalg.lstsq(
+        design * weight[:, np.newaxis], y * weight, rcond=None)
+
+    return coefficients
+
+
 def unbinned_polyfit(events: Iterable[float], grade: int,
                      t_start: Iterable[float], t_stop: Iterable[float],
                      exposure: float, bayes: bool) -> Tuple[Polynomial, float]:
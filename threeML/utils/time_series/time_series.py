@@ -239,8 +239,11 @@ class TimeSeries(object):
 
         total_counts = 0
 
+        # the integral basis is the same for all the polynomials
+        basis = self._polynomial_integral_basis(start, stop)
+
         for p in np.asarray(self._polynomials)[mask]:
-            total_counts += p.integral(start, stop)
+            total_counts += basis.dot(p.coefficients)
 
         return total_counts
 
@@ -257,13 +260,74 @@ class TimeSeries(object):
         if mask is None:
             mask = np.ones_like(self._polynomials, dtype=bool)
 
-        total_counts = 0
+        basis = self._polynomial_integral_basis(start, stop)
 
-        for p in np.asarray(self._polynomials)[mask]:
-            total_counts += p.integral_error(start, stop) ** 2
+        covariances = np.array(
+            [p.covariance_matrix for p in np.asarray(self._polynomials)[mask]]
+        )
+
+        # the squared errors c^T C c of all the selected polynomials
+        total_counts = np.einsum("k,ckl,l->", basis, covariances, basis)
 
         return np.sqrt(total_counts)
 
+    def _polynomial_integral_basis(self, start, stop) -> np.ndarray:
+        """
+        The integral basis of the channel polynomials between start and stop.
+        It is shared by all the channels, so that it can be contracted with
+        the coefficients and covariances of all of them at once
+
+        :param start: start of the interval
+        :param stop: stop of the interval
+        :return: the integral basis
+        """
+
+        degrees = set(p.degree for p in self._polynomials)
+
+        if len(degrees) > 1:
+
+            log.error("The channel polynomials do not all have the same degree "
+                      f"(found {sorted(degrees)}), cannot integrate them together")
+            raise RuntimeError()
+
+        return self._polynomials[0].integral_basis(start, stop)
+
+    def _polynomial_counts_and_errors(self, time_intervals):
+        """
+        The background counts and their errors of every channel, integrated
+        over the given time intervals. All the channels share the integral
+        basis, so it is evaluated only once per interval
+
+        :param time_intervals: the TimeIntervalSet to integrate over
+        :return: (counts, errors) arrays with one entry per channel
+        """
+
+        basis = np.array(
+            [
+                self._polynomial_integral_basis(tmin, tmax)
+                for tmin, tmax in zip(
+                    time_intervals.start_times, time_intervals.stop_times
+                )
+            ]
+        )
+
+        coefficients = np.array(
+            [polynomial.coefficients for polynomial in self._polynomials]
+        )
+
+        covariances = np.array(
+            [polynomial.covariance_matrix for polynomial in self._polynomials]
+        )
+
+        counts = coefficients.dot(basis.sum(axis=0))
+
+        # sum the squared errors c^T C c of the intervals, for all
+        # channels in a single contraction
+
+        errors = np.sqrt(np.einsum("ik,ckl,il->c", basis, covariances, basis))
+
+        return counts, errors
+
     @property
     def bins(self):
 